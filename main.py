@@ -1,14 +1,24 @@
 # main.py - Archivo principal del juego Gals Panic
 
+import time
+STARTUP_STARTED = time.perf_counter()  # Referencia para --startup-time
+
 import pygame
 import sys
-import os
+import argparse
 from scripts.config import *
 from scripts.menu import MenuManager
-from scripts.game import Game
+from scripts.profiler import FrameProfiler
+
+# game, replay y screenshots (NumPy, etiquetado, codificación PNG) se importan
+# al empezar la primera partida o captura, no antes del primer frame del menú
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, record_path=None, startup_time=False, fps=FPS):
+        # Marcas de tiempo del arranque (--startup-time)
+        self.startup_time = startup_time
+        self.startup_marks = [('imports', time.perf_counter())]
+        
         # Inicializar Pygame
         pygame.init()
         
@@ -24,15 +34,30 @@ class GameManager:
             pass  # Si no hay icono, continuar sin él
         
         self.clock = pygame.time.Clock()
+        self.fps = fps  # Límite del render (0 = sin límite)
         self.running = True
         
         # Estados del juego
         self.current_state = 'menu'  # 'menu' o 'game'
         
+        self.startup_marks.append(('ventana', time.perf_counter()))
+        
         # Inicializar sistemas
         self.menu_manager = MenuManager(self.screen)
+        self.startup_marks.append(('menú', time.perf_counter()))
         self.game = None
-        self.settings = {'volume': 100, 'difficulty': 'Normal'}
+        self.settings = dict(DEFAULT_SETTINGS)
+        
+        # Tiempos por fase del frame (se activa con el modo debug, F1)
+        self.profiler = FrameProfiler()
+        
+        # Capturas de pantalla guardadas en segundo plano (se crea con la primera)
+        self._screenshots = None
+        
+        # Grabación de partidas para reproducirlas con scripts.replay
+        self.record_path = record_path
+        self.recorder = None
+        self.recorded_games = 0
     
     def handle_events(self):
         """Maneja los eventos globales del juego"""
@@ -45,7 +70,10 @@ class GameManager:
                 if event.key == pygame.K_F11:
                     self._toggle_fullscreen()
                 elif event.key == pygame.K_F12:
-                    self._take_screenshot()
+                    if event.mod & pygame.KMOD_SHIFT:
+                        self._toggle_screenshot_burst()
+                    else:
+                        self._take_screenshot()
             
             # Delegar eventos según el estado actual
             if self.current_state == 'menu':
@@ -56,34 +84,66 @@ class GameManager:
                     self.running = False
             
             elif self.current_state == 'game' and self.game:
+                if self.recorder and event.type == pygame.KEYDOWN:
+                    self.recorder.record_event(event.key)
                 result = self.game.handle_events(event)
                 if result == 'menu':
                     self._return_to_menu()
     
     def update(self):
-        """Actualiza la lógica del juego según el estado actual"""
+        """Actualiza la lógica del juego según el estado actual (un tick)"""
+        if self._screenshots:
+            self._screenshots.on_tick()
         if self.current_state == 'menu':
             self.menu_manager.update()
         elif self.current_state == 'game' and self.game:
             self.game.update()
+            if self.recorder:
+                self.recorder.end_tick(self.game)
             
             # Verificar si el juego ha terminado
             if not self.game.is_running():
                 # El juego maneja sus propios estados de game over y level complete
                 pass
     
-    def draw(self):
-        """Dibuja la pantalla según el estado actual"""
+    def draw(self, alpha=1.0):
+        """Dibuja la pantalla según el estado actual (alpha: fracción del tick en curso)"""
         if self.current_state == 'menu':
             self.menu_manager.draw()
         elif self.current_state == 'game' and self.game:
-            self.game.draw()
+            self.game.draw(alpha)
         
         # Actualizar pantalla
         pygame.display.flip()
+        if self._screenshots:
+            self._screenshots.on_frame(self.screen)
+    
+    @property
+    def screenshots(self):
+        if self._screenshots is None:
+            from scripts.screenshots import ScreenshotWriter
+            self._screenshots = ScreenshotWriter()
+        return self._screenshots
+    
+    def _report_startup_time(self):
+        """Imprime el tiempo hasta el primer frame, desglosado por fase"""
+        self.startup_marks.append(('primer frame', time.perf_counter()))
+        previous = STARTUP_STARTED
+        phases = []
+        for name, mark in self.startup_marks:
+            phases.append(f"{name} {(mark - previous) * 1000:.1f} ms")
+            previous = mark
+        total = (previous - STARTUP_STARTED) * 1000
+        print(f"Tiempo hasta el primer frame: {total:.1f} ms ({', '.join(phases)})")
     
     def run(self):
-        """Bucle principal del juego"""
+        """Bucle principal del juego.
+        
+        La simulación avanza en ticks fijos de 1/TICK_RATE s con un acumulador;
+        el render va aparte (limitado a self.fps, o sin límite con 0) e interpola entre
+        ticks. Si un frame tarda, se ejecutan varios ticks seguidos y se
+        descartan frames de render, no ticks (hasta MAX_FRAME_TIME de retraso).
+        """
         print("Iniciando Gals Panic Remake...")
         print(f"Resolución: {WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         print("Controles:")
@@ -91,26 +151,84 @@ class GameManager:
         print("- P: Pausa")
         print("- ESC: Menú")
         print("- F11: Pantalla completa")
-        print("- F12: Captura de pantalla")
+        print("- F12: Captura de pantalla (Shift+F12: ráfaga)")
         
+        profiler = self.profiler
+        tick_duration = 1.0 / TICK_RATE
+        accumulator = 0.0
+        previous_time = time.perf_counter()
         while self.running:
+            frame_started = profiler.start()
+            
+            now = time.perf_counter()
+            accumulator += min(now - previous_time, MAX_FRAME_TIME)
+            previous_time = now
+            
+            started = profiler.start()
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            profiler.stop('frame.events', started)
+            if not self.running:
+                break
+            
+            started = profiler.start()
+            while accumulator >= tick_duration:
+                self.update()
+                accumulator -= tick_duration
+            profiler.stop('frame.update', started)
+            
+            started = profiler.start()
+            self.draw(accumulator / tick_duration)
+            profiler.stop('frame.draw', started)
+            if self.startup_time:
+                self._report_startup_time()
+                break
+            
+            started = profiler.start()
+            self.clock.tick(self.fps)
+            profiler.stop('frame.tick', started)
+            
+            profiler.stop('frame.total', frame_started)
         
         self._cleanup()
     
     def _start_game(self):
         """Inicia una nueva partida"""
         self.settings = self.menu_manager.get_settings()
-        self.game = Game(self.screen, self.settings)
+        from scripts.game import Game
+        
+        input_source = None
+        if self.record_path:
+            from scripts.replay import ReplayRecorder
+            self.recorder = ReplayRecorder(self._next_record_path(), self.settings)
+            input_source = self.recorder.wrap(pygame.key)
+            print(f"Grabando partida en {self.recorder.path}")
+        self.game = Game(self.screen, self.settings, input_source=input_source,
+                         profiler=self.profiler)
         self.current_state = 'game'
         print(f"Nuevo juego iniciado - Dificultad: {self.settings['difficulty']}")
     
+    def _next_record_path(self):
+        """Ruta de grabación: la indicada, con sufijo numérico desde la segunda partida"""
+        self.recorded_games += 1
+        if self.recorded_games == 1:
+            return self.record_path
+        stem, dot, extension = self.record_path.rpartition('.')
+        if not dot:
+            return f"{self.record_path}_{self.recorded_games}"
+        return f"{stem}_{self.recorded_games}.{extension}"
+    
+    def _stop_recording(self):
+        if self.recorder:
+            self.recorder.close()
+            print(f"Grabación guardada: {self.recorder.path} ({self.recorder.ticks} ticks)")
+            self.recorder = None
+    
     def _return_to_menu(self):
         """Vuelve al menú principal"""
+        self._stop_recording()
         self.current_state = 'menu'
+        if self.game:
+            self.game.shutdown()
         self.game = None
         print("Regresando al menú principal...")
     
@@ -126,32 +244,50 @@ class GameManager:
         self.menu_manager.screen = self.screen
         if self.game:
             self.game.screen = self.screen
+            self.game.invalidate_overlay()
     
     def _take_screenshot(self):
-        """Toma una captura de pantalla"""
-        try:
-            if not os.path.exists("screenshots"):
-                os.makedirs("screenshots")
-            
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshots/gals_panic_{timestamp}.png"
-            
-            pygame.image.save(self.screen, filename)
-            print(f"Captura guardada: {filename}")
-        except Exception as e:
-            print(f"Error al guardar captura: {e}")
+        """Toma una captura de pantalla (se codifica y guarda en segundo plano)"""
+        filename = self.screenshots.capture(self.screen)
+        if filename:
+            print(f"Guardando captura: {filename}")
+        else:
+            print("Captura descartada: hay demasiadas pendientes")
+    
+    def _toggle_screenshot_burst(self):
+        """Activa o desactiva el modo ráfaga (una captura cada N frames)"""
+        if self.screenshots.burst_active:
+            self.screenshots.stop_burst()
+            print("Ráfaga de capturas detenida")
+        else:
+            self.screenshots.start_burst()
+            print(f"Ráfaga de capturas: una cada {self.screenshots.burst_every} ticks")
     
     def _cleanup(self):
         """Limpia recursos antes de cerrar"""
         print("Cerrando juego...")
+        self._stop_recording()
+        if self.game:
+            self.game.shutdown()
+        if self._screenshots:
+            self._screenshots.close()
         pygame.quit()
         sys.exit()
 
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description="Gals Panic Remake")
+    parser.add_argument('--record', metavar='ARCHIVO',
+                        help="Grabar cada partida para reproducirla con python -m scripts.replay")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="Medir el tiempo hasta el primer frame y salir")
+    parser.add_argument('--fps', type=int, default=FPS,
+                        help=f"Límite de frames de render por segundo (0 = sin límite; por defecto {FPS})")
+    args = parser.parse_args()
+    
     try:
-        game_manager = GameManager()
+        game_manager = GameManager(record_path=args.record, startup_time=args.startup_time,
+                                   fps=args.fps)
         game_manager.run()
     except Exception as e:
         print(f"Error crítico: {e}")
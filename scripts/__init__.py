@@ -8,10 +8,23 @@ Contiene toda la lógica del juego, configuración y sistema de menús
 __version__ = "1.0.0"
 __author__ = "Danew Malavita"
 
-# Importaciones principales del paquete
+# Importaciones principales del paquete. menu y game (con pygame y NumPy)
+# se cargan al acceder a ellos por primera vez, no al importar el paquete
 from .config import *
-from .menu import MenuManager
-from .game import Game
+
+_LAZY_ATTRIBUTES = {
+    'MenuManager': '.menu',
+    'Game': '.game',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'MenuManager',
@@ -20,6 +33,7 @@ __all__ = [
     'WINDOW_WIDTH',
     'WINDOW_HEIGHT',
     'FPS',
+    'TICK_RATE',
     'BLACK',
     'WHITE',
     'BLUE',
@@ -0,0 +1,242 @@
+# benchmark.py - Micro-benchmarks de las operaciones de AreaManager
+
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import statistics
+
+import numpy as np
+import pygame
+from .config import *
+from .headless import init_headless
+from .game import AreaManager, Player
+
+# Tamaños de grid (ancho, alto): un cuarto, la mitad y el tamaño real del área de juego
+GRID_SIZES = [(295, 142), (590, 285), (1180, 570)]
+SCENARIOS = ['notch', 'half_sweep', 'spiral', 'fragmented']
+OPERATIONS = ['cut_area_with_trail', 'find_all_connected_areas', 'flood_fill_area',
+              'get_safe_spawn_position', 'is_on_border']
+
+class StaticEnemy:
+    """Enemigo inmóvil: solo expone la posición en coordenadas del área"""
+    def __init__(self, x, y):
+        self.position = (int(x), int(y))
+
+    def get_area_position(self):
+        return self.position
+
+def _stepped(points, step=3):
+    """Interpola una polilínea con puntos cada step píxeles, como un trail real"""
+    trail = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        steps = max(1, int(math.hypot(x1 - x0, y1 - y0) // step))
+        for i in range(steps):
+            trail.append((int(x0 + (x1 - x0) * i / steps), int(y0 + (y1 - y0) * i / steps)))
+    trail.append(points[-1])
+    return trail
+
+def scenario_trail(name, width, height):
+    """Trail sintético del escenario (coordenadas del área)"""
+    if name == 'notch':
+        # Muesca pequeña desde el borde superior
+        x0, x1 = int(width * 0.10), int(width * 0.15)
+        depth = int(height * 0.10)
+        return _stepped([(x0, 0), (x0, depth), (x1, depth), (x1, 0)])
+    if name == 'half_sweep':
+        # U que encierra la mitad izquierda del tablero
+        return _stepped([(0, 5), (width // 2, 5), (width // 2, height - 6), (0, height - 6)])
+    if name == 'spiral':
+        # Espiral desde el borde izquierdo hacia el centro
+        center_x, center_y = width / 2, height / 2
+        max_radius = min(width, height) * 0.45
+        points = [(0, int(center_y))]
+        turns = 3
+        for i in range(turns * 72 + 1):
+            angle = math.pi + i * 2 * math.pi / 72
+            radius = max_radius * (1 - i / (turns * 72 + 1))
+            points.append((int(center_x + radius * math.cos(angle)),
+                           int(center_y + radius * math.sin(angle))))
+        return _stepped(points)
+    if name == 'fragmented':
+        # Muesca que encierra a un enemigo sobre un tablero ya fragmentado:
+        # obliga a elegir entre las regiones sin enemigos
+        x0, x1 = int(width * 0.05), int(width * 0.30)
+        depth = int(height * 0.30)
+        return _stepped([(x0, 0), (x0, depth), (x1, depth), (x1, 0)])
+    raise ValueError(f"Escenario desconocido: {name}")
+
+def scenario_enemies(name, width, height):
+    """Enemigos del escenario; en 'fragmented' uno queda dentro del área encerrada"""
+    enemies = [StaticEnemy(width * 0.8, height * 0.8)]
+    if name == 'fragmented':
+        enemies.append(StaticEnemy(width * 0.15, height * 0.15))
+    return enemies
+
+def build_area(name, width, height, cell_size=AREA_CELL_SIZE):
+    """Crea un AreaManager con el estado previo del escenario"""
+    area = AreaManager(width, height, cell_size)
+    if name == 'fragmented':
+        # Rejilla de cortes finos: muchas regiones pequeñas, como al final de un nivel
+        grid_width, grid_height = area.grid_width, area.grid_height
+        spacing = max(8, min(grid_width, grid_height) // 12)
+        mask = np.zeros((grid_height, grid_width), dtype=np.bool_)
+        mask[spacing // 2::spacing, :] = True
+        mask[:, spacing // 2::spacing] = True
+        mask[:, :spacing // 2] = False  # Franja libre junto al borde izquierdo
+        area._apply_cut(mask, (0, 0, grid_width - 1, grid_height - 1))
+    return area
+
+def _time(function, repeats, setup=None):
+    """Ejecuta function repeats veces y devuelve los tiempos en ms (setup no se mide)"""
+    samples = []
+    for _ in range(repeats):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def run_case(operation, scenario, width, height, repeats, border_queries=10000,
+             cell_size=AREA_CELL_SIZE):
+    """Mide una operación sobre un escenario; devuelve la lista de tiempos en ms"""
+    trail = scenario_trail(scenario, width, height)
+    enemies = scenario_enemies(scenario, width, height)
+
+    if operation == 'cut_area_with_trail':
+        return _time(lambda area: area.cut_area_with_trail(trail, enemies), repeats,
+                     setup=lambda: build_area(scenario, width, height, cell_size))
+
+    area = build_area(scenario, width, height, cell_size)
+    if operation == 'find_all_connected_areas':
+        return _time(lambda _: area.find_all_connected_areas(area.playable_area), repeats)
+    if operation == 'flood_fill_area':
+        start_x, start_y = area.to_cell(*area.get_safe_spawn_position(margin=0))
+        return _time(lambda _: area.flood_fill_area(start_x, start_y, area.playable_area), repeats)
+    if operation == 'get_safe_spawn_position':
+        return _time(lambda _: area.get_safe_spawn_position(), repeats)
+    if operation == 'is_on_border':
+        # Tiempo total de border_queries consultas en posiciones pseudoaleatorias
+        player = Player(0, 0)
+        rng = np.random.default_rng(0)
+        xs = rng.integers(0, width, border_queries).tolist()
+        ys = rng.integers(0, height, border_queries).tolist()
+
+        def query(_):
+            for x, y in zip(xs, ys):
+                player.is_on_border(x, y, area)
+        return _time(query, repeats)
+    raise ValueError(f"Operación desconocida: {operation}")
+
+def summarize(samples):
+    return {
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'mean_ms': statistics.mean(samples),
+        'max_ms': max(samples),
+    }
+
+def run_suite(sizes=GRID_SIZES, scenarios=SCENARIOS, operations=OPERATIONS, repeats=5,
+              cell_size=AREA_CELL_SIZE):
+    """Ejecuta todas las combinaciones y devuelve el informe como diccionario"""
+    init_headless()
+    results = []
+    for width, height in sizes:
+        for scenario in scenarios:
+            for operation in operations:
+                samples = run_case(operation, scenario, width, height, repeats,
+                                   cell_size=cell_size)
+                entry = {
+                    'operation': operation,
+                    'scenario': scenario,
+                    'grid': f"{width}x{height}",
+                    'cell_size': cell_size,
+                    'repeats': repeats,
+                }
+                entry.update(summarize(samples))
+                results.append(entry)
+                print(f"{entry['grid']:>9} {scenario:<11} {operation:<25} "
+                      f"mediana {entry['median_ms']:9.3f} ms")
+
+    return {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'cut_fill_mode': CUT_FILL_MODE,
+            'label_workers': LABEL_WORKERS,
+            'cell_size': cell_size,
+        },
+        'results': results,
+    }
+
+def _case_key(entry, report):
+    """Clave de un caso: operación, escenario, grid y tamaño de celda.
+
+    Los informes sin cell_size por entrada toman el de meta (o 1).
+    """
+    cell_size = entry.get('cell_size', report.get('meta', {}).get('cell_size', 1))
+    return entry['operation'], entry['scenario'], entry['grid'], cell_size
+
+def compare(report, baseline, threshold):
+    """Compara medianas con un informe anterior; devuelve las regresiones encontradas.
+
+    Solo se comparan casos con el mismo tamaño de celda.
+    """
+    previous = {_case_key(r, baseline): r for r in baseline['results']}
+    regressions = []
+    for entry in report['results']:
+        old = previous.get(_case_key(entry, report))
+        if not old or old['median_ms'] <= 0:
+            continue
+        ratio = entry['median_ms'] / old['median_ms']
+        entry['baseline_median_ms'] = old['median_ms']
+        entry['ratio'] = ratio
+        if ratio > threshold:
+            regressions.append(entry)
+    return regressions
+
+def main(argv=None):
+    """Punto de entrada: python -m scripts.benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmarks de AreaManager")
+    parser.add_argument('--output', default='bench_results.json', help="Archivo JSON de resultados")
+    parser.add_argument('--repeats', type=int, default=5, help="Repeticiones por caso")
+    parser.add_argument('--sizes', help="Tamaños de grid, p. ej. 295x142,1180x570")
+    parser.add_argument('--scenarios', help=f"Subconjunto de {','.join(SCENARIOS)}")
+    parser.add_argument('--operations', help=f"Subconjunto de {','.join(OPERATIONS)}")
+    parser.add_argument('--cell-size', type=int, default=AREA_CELL_SIZE, choices=(1, 2, 4),
+                        help="Píxeles por celda del grid lógico")
+    parser.add_argument('--compare', help="Informe JSON anterior para detectar regresiones")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Factor de la mediana a partir del cual hay regresión")
+    args = parser.parse_args(argv)
+
+    sizes = GRID_SIZES
+    if args.sizes:
+        sizes = [tuple(int(v) for v in size.split('x')) for size in args.sizes.split(',')]
+    scenarios = args.scenarios.split(',') if args.scenarios else SCENARIOS
+    operations = args.operations.split(',') if args.operations else OPERATIONS
+
+    report = run_suite(sizes, scenarios, operations, args.repeats, args.cell_size)
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for entry in regressions:
+            print(f"REGRESIÓN {entry['grid']} {entry['scenario']} {entry['operation']}: "
+                  f"{entry['baseline_median_ms']:.3f} -> {entry['median_ms']:.3f} ms "
+                  f"(x{entry['ratio']:.2f})")
+        status = 1 if regressions else 0
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados guardados en {args.output}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,9 @@
 # Configuración de pantalla
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
-FPS = 60
+FPS = 60  # Límite de frames de render por segundo (0 = sin límite, con main.py --fps 0)
+TICK_RATE = 60  # Ticks de simulación por segundo; velocidades y contadores son por tick
+MAX_FRAME_TIME = 0.25  # Segundos de retraso máximos que la simulación recupera tras un bloqueo
 
 # Colores
 BLACK = (0, 0, 0)
@@ -28,21 +30,56 @@ MENU_SPACING = 20
 # Configuración del jugador
 PLAYER_SIZE = 12
 PLAYER_SPEED = 4
-TRAIL_MAX_LENGTH = 200
+TRAIL_MAX_LENGTH = 200  # Vértices del trail simplificado como máximo
+TRAIL_SIMPLIFY_TOLERANCE = 0.5  # Desviación máxima (px) del trail simplificado respecto al recorrido
+TRAIL_INDEX_CELL_SIZE = 32  # Tamaño de celda (px) del índice de segmentos del trail
+BORDER_THRESHOLD = 8  # Distancia (px) a un borde o área cortada para considerarse en el borde
+
+# Configuración del área de juego
+AREA_CELL_SIZE = 1  # Píxeles por lado de cada celda del grid lógico (1, 2 o 4)
+CUT_FILL_MODE = "scanline"  # "scanline" o "raycast" (referencia, un test por píxel)
+CUT_MODE = "thread"  # Cálculo de cortes: "thread", "process", "sliced" (por tramos) o "sync"
+CUT_SLICE_BUDGET_MS = 2.0  # En modo "sliced", tiempo máximo por tick dedicado al corte pendiente
+CUT_SLICE_ROWS = 32  # Filas por paso al repartir un corte entre ticks
+LABEL_WORKERS = 0  # Procesos del etiquetado por franjas (0 = etiquetado en serie)
+LABEL_PARALLEL_MIN_PIXELS = 1_000_000  # Tamaño mínimo del grid para repartir el etiquetado
 
 # Configuración de enemigos
 ENEMY_SIZE = 15
 ENEMY_SPEED_MIN = 1.5
 ENEMY_SPEED_MAX = 3.5
 ENEMY_COUNT = 3
+# Desde cuántos enemigos se actualizan en bloque (NumPy). Por debajo de unos 16
+# el paso NumPy es más lento que Enemy.update; como el juego normal no pasa de 8
+# enemigos, este camino solo se usa en pruebas de carga (headless --extra-enemies)
+ENEMY_BATCH_THRESHOLD = 24
 
 # Configuración del juego
 INITIAL_LIVES = 3
+DEFAULT_SETTINGS = {'volume': 100, 'difficulty': "Normal"}  # Opciones iniciales del menú y del juego
 TARGET_AREA_PERCENTAGE = 75
 POINTS_PER_AREA = 10
 
+# Efectos visuales
+PARTICLE_CAPACITY = 4096  # Partículas simultáneas como máximo (las sobrantes se descartan)
+PARTICLE_GRAVITY = 0.1
+
+# Instrumentación
+PROFILER_WINDOW = 300  # Frames en la ventana deslizante de tiempos por fase
+LOG_LEVEL = "WARNING"  # DEBUG, INFO, WARNING, ERROR u OFF (se puede cambiar con GALS_LOG_LEVEL)
+LOG_BUFFER_SIZE = 4096  # Mensajes retenidos en memoria antes de descartar los más antiguos
+LOG_FLUSH_INTERVAL = 0.25  # Segundos entre volcados del hilo de registro
+TEXT_CACHE_SIZE = 256  # Superficies de texto renderizado retenidas (LRU)
+
+# Capturas de pantalla
+SCREENSHOT_WORKERS = 2  # Hilos que codifican y guardan las capturas
+SCREENSHOT_QUEUE_SIZE = 8  # Capturas pendientes como máximo (las demás se descartan)
+SCREENSHOT_BURST_EVERY = 10  # En modo ráfaga (Shift+F12), una captura cada N ticks de simulación
+SCREENSHOT_COMPRESSION = 6  # Nivel de compresión zlib del PNG (1-9)
+
 # Rutas de archivos
 SCRIPTS_PATH = "scripts/"
 ASSETS_PATH = "assets/"
 IMAGES_PATH = ASSETS_PATH + "images/"
-SOUNDS_PATH = ASSETS_PATH + "sounds/"
\ No newline at end of file
+SOUNDS_PATH = ASSETS_PATH + "sounds/"
+SCREENSHOTS_PATH = "screenshots/"
\ No newline at end of file
@@ -0,0 +1,112 @@
+# cut_worker.py - Cálculo de cortes fuera del tick de simulación
+
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .config import *
+
+CUT_MODES = ('sync', 'thread', 'process', 'sliced')
+
+def _plan_cut(area_manager, trail_points, enemy_positions):
+    return area_manager.plan_cut(trail_points, enemy_positions)
+
+class CutWorker:
+    """Calcula un corte (AreaManager.plan_cut) en segundo plano, de uno en uno.
+
+    Solo commit_cut modifica el grid y Game no lo llama mientras hay un corte
+    pendiente, así que el grid no cambia durante el cálculo: en modo 'thread'
+    el hilo lee el propio AreaManager y en modo 'process' se envía una copia
+    sin superficie (AreaManager.snapshot). En modo 'sliced' no hay hilos: el
+    corte es un generador (plan_cut_steps) que advance() hace avanzar en el
+    propio tick hasta agotar el presupuesto. En modo 'sync' el plan se
+    calcula dentro de submit() y está listo de inmediato.
+    """
+    def __init__(self, mode=CUT_MODE):
+        if mode not in CUT_MODES:
+            raise ValueError(f"Modo de corte desconocido: {mode}")
+        self.mode = mode
+        self.busy = False
+        self._pending = None  # Future, o el CutPlan ya calculado ('sync' y 'sliced')
+        self._steps = None  # Generador del corte en curso en modo 'sliced'
+        self._executor = None
+        if mode == 'process':
+            # Arrancar el proceso al crear la partida y no en el primer corte
+            self._get_executor().submit(int)
+    
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == 'thread':
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cut')
+            else:
+                # spawn: el proceso principal ya tiene hilos (registro, capturas)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+    
+    def submit(self, area_manager, trail_points, enemy_positions):
+        """Empieza a calcular el corte; enemy_positions en coordenadas del área"""
+        if self.busy:
+            raise RuntimeError("Ya hay un corte pendiente")
+        if self.mode == 'sync':
+            self._pending = area_manager.plan_cut(trail_points, enemy_positions)
+        elif self.mode == 'sliced':
+            self._steps = area_manager.plan_cut_steps(trail_points, enemy_positions)
+        else:
+            if self.mode == 'process':
+                area_manager = area_manager.snapshot()
+            self._pending = self._get_executor().submit(
+                _plan_cut, area_manager, list(trail_points), list(enemy_positions))
+        self.busy = True
+    
+    def advance(self, budget_ms=CUT_SLICE_BUDGET_MS):
+        """En modo 'sliced', avanza el corte pendiente durante budget_ms como mucho.
+
+        El presupuesto se comprueba entre pasos, así que puede excederse en lo
+        que tarde un paso (una banda de CUT_SLICE_ROWS filas).
+        """
+        if self._steps is None:
+            return
+        deadline = time.perf_counter() + budget_ms / 1000
+        try:
+            while True:
+                next(self._steps)
+                if time.perf_counter() >= deadline:
+                    return
+        except StopIteration as stop:
+            self._pending = stop.value
+            self._steps = None
+    
+    def done(self):
+        """Verifica si el corte pendiente ya está calculado"""
+        if not self.busy:
+            return False
+        if self.mode == 'sliced':
+            return self._steps is None
+        return self.mode == 'sync' or self._pending.done()
+    
+    def result(self):
+        """Devuelve el CutPlan pendiente (o None) y libera el worker; espera si hace falta"""
+        if self._steps is not None:
+            self.advance(float('inf'))
+        pending, self._pending = self._pending, None
+        self.busy = False
+        if self.mode in ('sync', 'sliced'):
+            return pending
+        return pending.result()
+    
+    def cancel(self):
+        """Descarta el corte pendiente (el área para la que se calculó ya no existe)"""
+        if self.busy and self.mode in ('thread', 'process'):
+            self._pending.cancel()
+        if self._steps is not None:
+            self._steps.close()
+            self._steps = None
+        self._pending = None
+        self.busy = False
+    
+    def shutdown(self):
+        # cancel() ya cancela el único Future pendiente (cancel_futures es de Python 3.9)
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
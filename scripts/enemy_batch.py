@@ -0,0 +1,119 @@
+# enemy_batch.py - Actualización vectorizada de enemigos con rebote
+
+import random
+import numpy as np
+from operator import attrgetter
+from .config import *
+
+STATE_FIELDS = ('x', 'y', 'direction_x', 'direction_y', 'speed',
+                'game_area_offset_x', 'game_area_offset_y')
+_read_fields = attrgetter(*STATE_FIELDS)
+
+def _read_state(enemy):
+    """Fila de estado: STATE_FIELDS, last_position, size y stuck_counter"""
+    return _read_fields(enemy) + enemy.last_position + (enemy.size, enemy.stuck_counter)
+
+class EnemyBatch:
+    """Avanza en un solo paso NumPy todos los enemigos 'bouncer' y 'fast'.
+
+    Reproduce Enemy.update para esos tipos: detección de atasco, los cinco
+    puntos de prueba contra el bitmap jugable, rebote con variación aleatoria,
+    normalización de la dirección y recorte a los límites. Los enemigos
+    siguen siendo objetos Enemy: sus atributos se leen al principio del tick
+    y se escriben al final. Los demás tipos usan su update() habitual.
+    """
+    BATCHED_TYPES = ("bouncer", "fast")
+
+    def __init__(self):
+        # Semilla tomada de random: random.seed() también fija los rebotes
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def update(self, enemies, game_area, area_manager, player=None):
+        group = []
+        for enemy in enemies:
+            if enemy.type in self.BATCHED_TYPES:
+                group.append(enemy)
+            else:
+                enemy.update(game_area, area_manager, player)
+        if group:
+            self._update_bouncers(group, game_area, area_manager)
+
+    def _update_bouncers(self, group, game_area, area_manager):
+        n = len(group)
+        state = np.array([_read_state(e) for e in group], dtype=float).T
+        x, y, dir_x, dir_y, speed, offset_x, offset_y, last_x, last_y = state[:9].copy()
+        size = state[9].astype(np.int64)
+        stuck = state[10].astype(np.int64)
+
+        # Detección de atasco (menos de 1 px de movimiento desde el tick anterior)
+        still = (np.abs(x - last_x) < 1) & (np.abs(y - last_y) < 1)
+        stuck = np.where(still, stuck + 1, 0)
+        last_x, last_y = x.copy(), y.copy()
+        for i in np.flatnonzero(stuck > TICK_RATE).tolist():
+            enemy = group[i]
+            enemy.relocate(area_manager)
+            x[i], y[i] = enemy.x, enemy.y
+            dir_x[i], dir_y[i] = enemy.direction_x, enemy.direction_y
+            stuck[i] = 0
+
+        new_x = x + speed * dir_x
+        new_y = y + speed * dir_y
+
+        # Límites del área de pantalla
+        min_x, min_y = game_area['x'], game_area['y']
+        max_x = game_area['x'] + game_area['width'] - size
+        max_y = game_area['y'] + game_area['height'] - size
+        hit_x = (new_x <= min_x) | (new_x >= max_x)
+        hit_y = (new_y <= min_y) | (new_y >= max_y)
+
+        # Áreas cortadas: el primer punto de prueba inválido decide el eje del rebote
+        probe = np.flatnonzero(~(hit_x | hit_y))
+        if len(probe):
+            s = size[probe]
+            test_x = new_x[probe, None] + np.stack([np.full_like(s, 2), s - 2, np.full_like(s, 2), s - 2, s // 2], axis=1)
+            test_y = new_y[probe, None] + np.stack([np.full_like(s, 2), np.full_like(s, 2), s - 2, s - 2, s // 2], axis=1)
+            area_x = (test_x - offset_x[probe, None]).astype(np.int64)
+            area_y = (test_y - offset_y[probe, None]).astype(np.int64)
+            inside = ((area_x >= 0) & (area_x < area_manager.width) &
+                      (area_y >= 0) & (area_y < area_manager.height))
+            blocked = np.zeros(inside.shape, dtype=np.bool_)
+            blocked[inside] = ~area_manager.positions_valid(area_x[inside], area_y[inside])
+
+            rows = np.flatnonzero(blocked.any(axis=1))
+            if len(rows):
+                first = blocked[rows].argmax(axis=1)
+                hit = probe[rows]
+                center_x = x[hit] + size[hit] // 2
+                center_y = y[hit] + size[hit] // 2
+                horizontal = (np.abs(test_x[rows, first] - center_x) >
+                              np.abs(test_y[rows, first] - center_y))
+                hit_x[hit[horizontal]] = True
+                hit_y[hit[~horizontal]] = True
+
+        # Rebotes con pequeña variación aleatoria; sin rebote se aplica el movimiento
+        jitter_x = self.rng.uniform(-0.1, 0.1, n)
+        jitter_y = self.rng.uniform(-0.1, 0.1, n)
+        dir_x = np.where(hit_x, -dir_x + jitter_x, dir_x)
+        dir_y = np.where(hit_y, -dir_y + jitter_y, dir_y)
+        x = np.where(hit_x, x, new_x)
+        y = np.where(hit_y, y, new_y)
+
+        # Normalizar direcciones para mantener velocidad constante
+        magnitude = np.hypot(dir_x, dir_y)
+        moving = magnitude > 0
+        dir_x[moving] /= magnitude[moving]
+        dir_y[moving] /= magnitude[moving]
+
+        # Mantener dentro de los límites
+        x = np.maximum(min_x, np.minimum(x, max_x))
+        y = np.maximum(min_y, np.minimum(y, max_y))
+
+        for enemy, ex, ey, dx, dy, lx, ly, sc in zip(
+                group, x.tolist(), y.tolist(), dir_x.tolist(), dir_y.tolist(),
+                last_x.tolist(), last_y.tolist(), stuck.tolist()):
+            enemy.x = ex
+            enemy.y = ey
+            enemy.direction_x = dx
+            enemy.direction_y = dy
+            enemy.last_position = (lx, ly)
+            enemy.stuck_counter = sc
@@ -1,10 +1,27 @@
 # game.py - Sistema de recorte mejorado para Gals Panic
 
 import pygame
+import copy
 import math
 import random
+import numpy as np
 from enum import Enum
+from collections import deque
 from .config import *
+from .labeling import label_components, run_steps, RegionMap
+from .trail import TrailBuffer
+from .spatial import CellMapping, OccupancyPyramid
+from .profiler import FrameProfiler
+from .text_cache import get_font, render_text
+from .particles import ParticleSystem
+from .enemy_batch import EnemyBatch
+from .cut_worker import CutWorker
+from . import logger
+
+log = logger.get_logger(__name__)
+
+# Aristas del polígono de corte procesadas entre dos pausas de plan_cut_steps
+_EDGES_PER_STEP = 256
 
 class GameState(Enum):
     PLAYING = 1
@@ -12,13 +29,78 @@ class GameState(Enum):
     GAME_OVER = 3
     LEVEL_COMPLETE = 4
 
+def _dilate_square_steps(mask, radius):
+    """Dilata una máscara [y, x] con un cuadrado de lado 2 * radius + 1.
+    
+    El resultado mide radius píxeles más por cada lado que la máscara original.
+    Generador: cede el control cada CUT_SLICE_ROWS filas (ver run_steps).
+    """
+    height, width = mask.shape
+    size = 2 * radius + 1
+    band = CUT_SLICE_ROWS
+    
+    # Sumas de ventana deslizante separables (horizontal y luego vertical);
+    # las filas de relleno (2 * radius arriba y abajo) suman cero
+    horizontal = np.zeros((height + 4 * radius, width + 2 * radius), dtype=np.int32)
+    for top in range(0, height, band):
+        rows = mask[top:top + band]
+        sums = np.zeros((rows.shape[0], width + 4 * radius + 1), dtype=np.int32)
+        np.cumsum(rows, axis=1, out=sums[:, 2 * radius + 1:2 * radius + 1 + width])
+        sums[:, 2 * radius + 1 + width:] = sums[:, 2 * radius + width:2 * radius + 1 + width]
+        horizontal[2 * radius + top:2 * radius + top + rows.shape[0]] = sums[:, size:] - sums[:, :-size]
+        yield
+    
+    # Cada banda de salida suma size filas consecutivas de horizontal
+    out_height = height + 2 * radius
+    result = np.empty((out_height, width + 2 * radius), dtype=np.bool_)
+    for top in range(0, out_height, band):
+        bottom = min(top + band, out_height)
+        sums = np.zeros((bottom - top + size, width + 2 * radius), dtype=np.int32)
+        np.cumsum(horizontal[top:bottom + size - 1], axis=0, out=sums[1:])
+        result[top:bottom] = (sums[size:] - sums[:-size]) > 0
+        yield
+    return result
+
+class CutPlan:
+    """Corte ya calculado: celdas a eliminar y estado resultante, listo para aplicar"""
+    __slots__ = ('mask', 'rect', 'regions', 'border', 'cells')
+    
+    def __init__(self, mask, rect, regions, border, cells):
+        self.mask = mask  # [y, x] del tamaño de rect
+        self.rect = rect  # (min_x, min_y, max_x, max_y) inclusivo, en celdas
+        self.regions = regions  # RegionMap tras el corte
+        self.border = border  # ((x0, y0, x1, y1), parche) que se añade a near_border
+        self.cells = cells  # CellMapping del área
+    
+    def covers(self, x, y):
+        """Verifica si el punto (píxeles del área) está entre las celdas a eliminar"""
+        min_x, min_y, max_x, max_y = self.rect
+        x, y = self.cells.to_cell(x, y)
+        return (min_x <= x <= max_x and min_y <= y <= max_y and
+                bool(self.mask[y - min_y, x - min_x]))
+
 class AreaManager:
-    """Gestiona las áreas cortadas y la reducción del área de juego"""
-    def __init__(self, width, height):
+    """Gestiona las áreas cortadas y la reducción del área de juego.
+    
+    width y height son los píxeles del área, y la interfaz pública (jugador,
+    enemigos, trails, spawn) usa siempre píxeles del área. La lógica trabaja
+    sobre un grid de celdas de cell_size x cell_size píxeles: todas las
+    conversiones pasan por self.cells (CellMapping), y rect, máscaras y
+    etiquetas están en celdas. La superficie se mantiene a resolución completa.
+    """
+    def __init__(self, width, height, cell_size=AREA_CELL_SIZE):
         self.width = width
         self.height = height
+        self.cells = CellMapping(cell_size)
+        self.cell_size = cell_size
+        self.cell_area = self.cells.area
+        self.grid_width = self.cells.cells_for(width)
+        self.grid_height = self.cells.cells_for(height)
         # Grid que representa el área de juego (True = área válida, False = cortada/bloqueada)
-        self.playable_area = [[True for _ in range(width)] for _ in range(height)]
+        # Array contiguo indexado como [y, x], una posición por celda
+        self.playable_area = np.ones((self.grid_height, self.grid_width), dtype=np.bool_)
+        # Conteos jerárquicos de celdas válidas, actualizados en cada corte
+        self.occupancy = OccupancyPyramid(self.playable_area)
         self.total_pixels = width * height
         self.cut_pixels = 0
         
@@ -26,13 +108,34 @@ class AreaManager:
         self.area_surface = pygame.Surface((width, height))
         self.area_surface.fill(WHITE)  # Blanco = área de juego
         
+        # Modo de relleno del polígono de corte ('scanline' o 'raycast' de referencia)
+        self.fill_mode = CUT_FILL_MODE
+        
+        # Procesos para etiquetar por franjas el tablero y las ventanas grandes de
+        # cada corte (0 = en serie)
+        self.label_workers = LABEL_WORKERS
+        
         # Marcar bordes como límites (no cortables pero válidos para caminar)
         self.border_thickness = 2
-        for y in range(self.height):
-            for x in range(self.width):
-                if (x < self.border_thickness or x >= self.width - self.border_thickness or 
-                    y < self.border_thickness or y >= self.height - self.border_thickness):
-                    pass  # Los bordes siguen siendo válidos para caminar
+        self.border_margin = self.cells.cells_for(3)  # Margen (celdas) para considerar que un área toca el borde
+        
+        # Etiquetado persistente de regiones, actualizado solo en la zona de cada corte
+        self.regions = RegionMap(self.playable_area, self.border_margin, self.label_workers)
+        
+        # Mapa de proximidad: True a BORDER_THRESHOLD o menos (distancia Chebyshev,
+        # redondeada a celdas) de un borde del área o de una celda cortada.
+        # Se amplía tras cada corte.
+        self.border_threshold = self.cells.cells_for(BORDER_THRESHOLD)
+        grid_height, grid_width = self.grid_height, self.grid_width
+        self.near_border = np.zeros((grid_height, grid_width), dtype=np.bool_)
+        self.near_border[:self.border_threshold + 1, :] = True
+        self.near_border[grid_height - self.border_threshold - 1:, :] = True
+        self.near_border[:, :self.border_threshold + 1] = True
+        self.near_border[:, grid_width - self.border_threshold - 1:] = True
+    
+    def to_cell(self, x, y):
+        """Celda (x, y) del grid lógico que contiene un punto en píxeles del área"""
+        return self.cells.to_cell(x, y)
         
     def is_point_inside_polygon(self, x, y, polygon_points):
         """Determina si un punto está dentro de un polígono usando ray casting mejorado"""
@@ -56,10 +159,95 @@ class AreaManager:
         
         return inside
     
+    def rasterize_polygon(self, polygon_points, min_x, min_y, max_x, max_y):
+        """Devuelve la máscara [y, x] del polígono dentro de la caja (min_x..max_x, min_y..max_y)"""
+        return run_steps(self.rasterize_polygon_steps(polygon_points, min_x, min_y, max_x, max_y))
+    
+    def rasterize_polygon_steps(self, polygon_points, min_x, min_y, max_x, max_y):
+        """rasterize_polygon por pasos (el relleno de referencia no se reparte)"""
+        if self.fill_mode == 'raycast':
+            return self._rasterize_raycast(polygon_points, min_x, min_y, max_x, max_y)
+        return (yield from self._rasterize_scanline_steps(polygon_points, min_x, min_y, max_x, max_y))
+    
+    def _rasterize_raycast(self, polygon_points, min_x, min_y, max_x, max_y):
+        """Relleno de referencia: un ray casting por píxel de la caja"""
+        mask = np.zeros((max_y - min_y + 1, max_x - min_x + 1), dtype=np.bool_)
+        for y in range(min_y, max_y + 1):
+            for x in range(min_x, max_x + 1):
+                if self.is_point_inside_polygon(x, y, polygon_points):
+                    mask[y - min_y, x - min_x] = True
+        return mask
+    
+    def _rasterize_scanline_steps(self, polygon_points, min_x, min_y, max_x, max_y):
+        """Relleno por scanline (tabla de aristas + aristas activas), O(píxeles + aristas).
+        
+        Usa la misma regla que is_point_inside_polygon: el píxel (x, y) se evalúa en
+        (x + 0.001, y + 0.001) y cuenta los cruces con la paridad par-impar.
+        Cede el control cada CUT_SLICE_ROWS filas.
+        """
+        mask = np.zeros((max_y - min_y + 1, max_x - min_x + 1), dtype=np.bool_)
+        if len(polygon_points) < 3:
+            return mask
+        
+        # Tabla de aristas: cada arista se registra en la primera fila que cruza
+        edge_table = {}
+        j = len(polygon_points) - 1
+        for i in range(len(polygon_points)):
+            if i and i % _EDGES_PER_STEP == 0:
+                yield
+            xi, yi = polygon_points[i]
+            xj, yj = polygon_points[j]
+            j = i
+            
+            if yi == yj:
+                continue  # Las aristas horizontales nunca cruzan el rayo
+            
+            # Filas y con min(yi, yj) <= y + 0.001 < max(yi, yj)
+            first_row = max(min_y, self._first_index_at_or_after(min(yi, yj)))
+            last_row = min(max_y, self._first_index_at_or_after(max(yi, yj)) - 1)
+            if first_row <= last_row:
+                edge_table.setdefault(first_row, []).append((last_row, xi, yi, xj, yj))
+        
+        active_edges = []
+        for y in range(min_y, max_y + 1):
+            if y > min_y and (y - min_y) % CUT_SLICE_ROWS == 0:
+                yield
+            if y in edge_table:
+                active_edges.extend(edge_table[y])
+            if not active_edges:
+                continue
+            
+            active_edges = [edge for edge in active_edges if edge[0] >= y]
+            
+            # Intersecciones del rayo con las aristas activas (misma fórmula que el ray casting)
+            py = y + 0.001
+            crossings = sorted((xj - xi) * (py - yi) / (yj - yi) + xi
+                               for _, xi, yi, xj, yj in active_edges)
+            
+            row = mask[y - min_y]
+            for k in range(0, len(crossings) - 1, 2):
+                start = max(min_x, self._first_index_at_or_after(crossings[k]))
+                end = min(max_x + 1, self._first_index_at_or_after(crossings[k + 1]))
+                if start < end:
+                    row[start - min_x:end - min_x] = True
+        
+        return mask
+    
+    @staticmethod
+    def _first_index_at_or_after(value):
+        """Menor entero n tal que n + 0.001 no queda por debajo de value (comparación exacta)"""
+        n = math.ceil(value - 0.001)
+        while n + 0.001 < value:
+            n += 1
+        while n - 1 + 0.001 >= value:
+            n -= 1
+        return n
+    
     def flood_fill_area(self, start_x, start_y, area_grid):
-        """Encuentra el área conectada usando flood fill iterativo optimizado"""
-        if (not (0 <= start_x < self.width and 0 <= start_y < self.height) or
-            not area_grid[start_y][start_x]):
+        """Encuentra el área conectada usando flood fill iterativo optimizado (en celdas)"""
+        width, height = self.grid_width, self.grid_height
+        if (not (0 <= start_x < width and 0 <= start_y < height) or
+            not area_grid[start_y, start_x]):
             return []
         
         area_pixels = []
@@ -69,10 +257,10 @@ class AreaManager:
         while stack:
             x, y = stack.pop()
             
-            if (x, y) in visited or x < 0 or x >= self.width or y < 0 or y >= self.height:
+            if (x, y) in visited or x < 0 or x >= width or y < 0 or y >= height:
                 continue
                 
-            if not area_grid[y][x]:
+            if not area_grid[y, x]:
                 continue
                 
             visited.add((x, y))
@@ -87,78 +275,65 @@ class AreaManager:
         return area_pixels
     
     def find_all_connected_areas(self, area_grid):
-        """Encuentra todas las áreas conectadas separadas"""
-        visited = set()
-        areas = []
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                if area_grid[y][x] and (x, y) not in visited:
-                    area_pixels = self.flood_fill_area(x, y, area_grid)
-                    if area_pixels:
-                        areas.append(area_pixels)
-                        visited.update(area_pixels)
-        
-        return areas
-    
-    def area_contains_border(self, area_pixels):
-        """Verifica si un área toca cualquier borde del área de juego"""
-        border_margin = 3  # Margen más amplio para detectar bordes
-        
-        for x, y in area_pixels:
-            if (x <= border_margin or x >= self.width - border_margin - 1 or 
-                y <= border_margin or y >= self.height - border_margin - 1):
-                return True
-        return False
-    
-    def area_contains_enemies(self, area_pixels, enemies):
-        """Verifica si un área contiene enemigos"""
-        area_set = set(area_pixels)
-        
-        for enemy in enemies:
-            enemy_area_x, enemy_area_y = enemy.get_area_position()
-            
-            # Verificar un área 3x3 alrededor del enemigo para mayor precisión
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    check_x = enemy_area_x + dx
-                    check_y = enemy_area_y + dy
-                    
-                    if (check_x, check_y) in area_set:
-                        return True
+        """Etiqueta las áreas conectadas separadas.
         
-        return False
+        Devuelve (labels, components): la imagen de etiquetas y un ComponentStats
+        por área (tamaño, caja y si toca el borde), sin listas de píxeles.
+        """
+        return label_components(area_grid, border_margin=self.border_margin,
+                                workers=self.label_workers)
     
     def get_polygon_bounding_box(self, polygon_points):
-        """Obtiene la caja delimitadora de un polígono con márgenes"""
+        """Obtiene la caja delimitadora (en celdas) de un polígono en celdas, con márgenes"""
         if not polygon_points:
-            return 0, 0, self.width, self.height
+            return 0, 0, self.grid_width, self.grid_height
         
         min_x = max(0, min(p[0] for p in polygon_points) - 1)
-        max_x = min(self.width - 1, max(p[0] for p in polygon_points) + 1)
+        max_x = min(self.grid_width - 1, max(p[0] for p in polygon_points) + 1)
         min_y = max(0, min(p[1] for p in polygon_points) - 1)
-        max_y = min(self.height - 1, max(p[1] for p in polygon_points) + 1)
+        max_y = min(self.grid_height - 1, max(p[1] for p in polygon_points) + 1)
         
         return int(min_x), int(min_y), int(max_x), int(max_y)
     
     def cut_area_with_trail(self, trail_points, enemies):
         """Corta el área usando el trail del jugador - Versión mejorada"""
+        enemy_positions = [enemy.get_area_position() for enemy in enemies]
+        return self.commit_cut(self.plan_cut(trail_points, enemy_positions))
+    
+    def plan_cut(self, trail_points, enemy_positions):
+        """Decide qué celdas elimina el trail sin modificar el área.
+        
+        trail_points y enemy_positions están en píxeles del área. Devuelve un
+        CutPlan para commit_cut, o None si el trail no corta nada. Los
+        reetiquetados grandes usan label_workers procesos.
+        """
+        return run_steps(self.plan_cut_steps(trail_points, enemy_positions, self.label_workers))
+    
+    def plan_cut_steps(self, trail_points, enemy_positions, label_workers=0):
+        """plan_cut como generador reanudable: cede el control entre bandas de filas.
+        
+        Permite repartir el cálculo de un corte entre varios ticks (ver
+        CutWorker en modo 'sliced'); el CutPlan es el valor de retorno.
+        Con label_workers > 1 los reetiquetados grandes se hacen de una vez en
+        varios procesos, así que el modo 'sliced' usa el valor por defecto.
+        """
         if len(trail_points) < 4:  # Necesitamos al menos 4 puntos para un polígono válido
-            print("Trail muy corto para formar un polígono válido")
-            return 0
+            log.debug("Trail muy corto para formar un polígono válido")
+            return None
         
-        print(f"Iniciando corte con {len(trail_points)} puntos del trail")
+        log.debug("Iniciando corte con %d puntos del trail", len(trail_points))
         
-        # Limpiar y validar el trail
+        # Limpiar y validar el trail, y pasarlo a celdas
         valid_trail = []
         for point in trail_points:
             x, y = int(point[0]), int(point[1])
             if 0 <= x < self.width and 0 <= y < self.height:
-                valid_trail.append((x, y))
+                valid_trail.append(self.to_cell(x, y))
+        enemy_positions = [self.to_cell(x, y) for x, y in enemy_positions]
         
         if len(valid_trail) < 4:
-            print("No hay suficientes puntos válidos en el trail")
-            return 0
+            log.debug("No hay suficientes puntos válidos en el trail")
+            return None
         
         # Cerrar el polígono si es necesario
         if valid_trail[0] != valid_trail[-1]:
@@ -168,113 +343,248 @@ class AreaManager:
             if closest_border:
                 valid_trail.append(closest_border)
         
-        print(f"Trail válido con {len(valid_trail)} puntos")
+        log.debug("Trail válido con %d puntos", len(valid_trail))
         
         # Crear copia del área actual
-        temp_area = [row[:] for row in self.playable_area]
+        temp_area = self.playable_area.copy()
+        yield
         
         # Obtener bounding box para optimizar el procesamiento
         min_x, min_y, max_x, max_y = self.get_polygon_bounding_box(valid_trail)
         
         # Marcar píxeles dentro del polígono
-        enclosed_pixels = []
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                if temp_area[y][x] and self.is_point_inside_polygon(x, y, valid_trail):
-                    enclosed_pixels.append((x, y))
-                    temp_area[y][x] = False  # Marcar como cortado temporalmente
-        
-        print(f"Píxeles encerrados: {len(enclosed_pixels)}")
-        
-        if len(enclosed_pixels) < 10:  # Área mínima para ser válida
-            print("Área encerrada demasiado pequeña")
-            return 0
-        
-        # Encontrar todas las áreas conectadas después del corte simulado
-        connected_areas = self.find_all_connected_areas(temp_area)
-        print(f"Áreas conectadas después del corte: {len(connected_areas)}")
+        enclosed_mask = np.zeros_like(self.playable_area)
+        window = (slice(min_y, max_y + 1), slice(min_x, max_x + 1))
+        polygon_mask = yield from self.rasterize_polygon_steps(valid_trail, min_x, min_y, max_x, max_y)
+        enclosed_mask[window] = polygon_mask & temp_area[window]
+        yield
+        temp_area[window] &= ~enclosed_mask[window]  # Marcar como cortado temporalmente
+        enclosed_count = int(np.count_nonzero(enclosed_mask[window]))
+        yield
+        
+        log.debug("Píxeles encerrados: %d", enclosed_count)
+        
+        if enclosed_count * self.cell_area < 10:  # Área mínima (píxeles) para ser válida
+            log.debug("Área encerrada demasiado pequeña")
+            return None
         
         # Determinar qué área eliminar según la lógica del Gals Panic
-        area_to_remove = None
-        
         # Verificar si el área encerrada contiene enemigos
-        enclosed_has_enemies = self.area_contains_enemies(enclosed_pixels, enemies)
-        print(f"Área encerrada contiene enemigos: {enclosed_has_enemies}")
+        enclosed_has_enemies = self.mask_contains_enemies(enclosed_mask, enemy_positions)
+        log.debug("Área encerrada contiene enemigos: %s", enclosed_has_enemies)
         
         if not enclosed_has_enemies:
             # El área encerrada no contiene enemigos -> eliminarla
-            area_to_remove = enclosed_pixels
-            print("Eliminando área encerrada (sin enemigos)")
-        else:
-            # El área encerrada contiene enemigos -> eliminar otra área
-            # Buscar la menor área que no toque bordes y no contenga enemigos
-            best_area = None
-            best_size = float('inf')
-            
-            for area in connected_areas:
-                if (not self.area_contains_border(area) and 
-                    not self.area_contains_enemies(area, enemies) and
-                    len(area) < best_size and
-                    len(area) >= 10):  # Tamaño mínimo
-                    best_area = area
-                    best_size = len(area)
-            
-            if best_area:
-                area_to_remove = best_area
-                print(f"Eliminando área sin enemigos ni bordes ({len(best_area)} píxeles)")
-            else:
-                print("No se encontró área válida para eliminar")
-                return 0
+            log.debug("Eliminando área encerrada (sin enemigos)")
+            return (yield from self._prepare_cut_steps(enclosed_mask[window],
+                                                       (min_x, min_y, max_x, max_y), label_workers))
+        
+        # El área encerrada contiene enemigos -> eliminar otra área
+        # Simular el corte sobre una copia del etiquetado persistente
+        simulated = self.regions.copy()
+        yield
+        yield from simulated.remove_steps(temp_area, (min_x, min_y, max_x, max_y), label_workers)
+        labels, components = simulated.labels, simulated.components()
+        log.debug("Áreas conectadas después del corte: %d", len(components))
+        
+        # Buscar la menor área que no toque bordes y no contenga enemigos
+        # (desempate determinista por posición de la caja)
+        enemy_labels = self.labels_near_enemies(labels, enemy_positions)
+        best_area = None
+        
+        for area in sorted(components, key=lambda c: (c.bbox[1], c.bbox[0], c.label)):
+            if (not area.touches_border and 
+                area.label not in enemy_labels and
+                area.pixel_count * self.cell_area >= 10 and  # Tamaño mínimo (píxeles)
+                (best_area is None or area.pixel_count < best_area.pixel_count)):
+                best_area = area
+        
+        if best_area:
+            log.debug("Eliminando área sin enemigos ni bordes (%d celdas)", best_area.pixel_count)
+            component_mask = self._component_mask(labels, best_area)
+            yield
+            return (yield from self._prepare_cut_steps(component_mask, best_area.bbox, label_workers))
+        
+        log.debug("No se encontró área válida para eliminar")
+        return None
+    
+    def _prepare_cut(self, cut_mask, rect):
+        """Calcula el estado tras eliminar cut_mask (regiones y proximidad) sin aplicarlo.
         
-        # Aplicar el corte real
-        if area_to_remove:
-            pixels_removed = self._apply_cut(area_to_remove)
-            print(f"¡Área cortada! {pixels_removed} píxeles eliminados")
-            return pixels_removed
+        Es la parte cara del corte; commit_cut solo copia el resultado.
+        """
+        return run_steps(self._prepare_cut_steps(cut_mask, rect, self.label_workers))
+    
+    def _prepare_cut_steps(self, cut_mask, rect, label_workers=0):
+        min_x, min_y, max_x, max_y = rect
+        window = (slice(min_y, max_y + 1), slice(min_x, max_x + 1))
+        removed = cut_mask & self.playable_area[window]
+        if not removed.any():
+            return None
         
-        return 0
+        grid = self.playable_area.copy()
+        grid[window] &= ~removed
+        yield
+        regions = self.regions.copy()
+        yield
+        yield from regions.remove_steps(grid, rect, label_workers)
+        border = yield from self._near_border_patch_steps(removed, rect)
+        return CutPlan(removed, rect, regions, border, self.cells)
     
-    def _apply_cut(self, pixels_to_remove):
-        """Aplica el corte eliminando los píxeles especificados"""
-        pixels_removed = 0
+    def commit_cut(self, plan):
+        """Aplica un CutPlan de plan_cut; devuelve los píxeles eliminados.
         
-        for x, y in pixels_to_remove:
-            if (0 <= x < self.width and 0 <= y < self.height and 
-                self.playable_area[y][x]):
-                self.playable_area[y][x] = False
-                self.area_surface.set_at((x, y), LIGHT_BLUE)
-                pixels_removed += 1
+        El plan solo es válido para el área sobre la que se calculó: entre
+        plan_cut y commit_cut no se debe aplicar ningún otro corte.
+        """
+        if plan is None:
+            return 0
+        min_x, min_y, max_x, max_y = plan.rect
+        window = (slice(min_y, max_y + 1), slice(min_x, max_x + 1))
+        removed = plan.mask
+        
+        self.playable_area[window][removed] = False
+        self.occupancy.update(plan.rect)
+        self.regions = plan.regions
+        (x0, y0, x1, y1), patch = plan.border
+        self.near_border[y0:y1 + 1, x0:x1 + 1] |= patch
+        
+        # Celdas a píxeles de la superficie (las de la última fila y columna
+        # pueden quedar recortadas por el tamaño del área)
+        pixel_x, pixel_y = self.cells.to_pixel(min_x, min_y)
+        removed = self.cells.expand(removed)[:self.height - pixel_y, :self.width - pixel_x]
+        pixels_removed = int(np.count_nonzero(removed))
+        
+        # Actualización en bloque de la superficie, limitada al rectángulo sucio
+        # (surfarray indexa como [x, y]; con pixels2d se escribe un entero por
+        # píxel en lugar de tres canales)
+        surface_pixels = pygame.surfarray.pixels2d(self.area_surface)
+        surface_pixels[pixel_x:pixel_x + removed.shape[1],
+                       pixel_y:pixel_y + removed.shape[0]][removed.T] = self.area_surface.map_rgb(LIGHT_BLUE)
+        del surface_pixels  # Libera el bloqueo de la superficie
         
         self.cut_pixels += pixels_removed
+        log.debug("¡Área cortada! %d píxeles eliminados", pixels_removed)
         return pixels_removed
     
+    def snapshot(self):
+        """Copia del estado lógico (grid y regiones) sin la superficie de pygame.
+        
+        Basta para plan_cut y se puede serializar para calcular cortes en otro proceso.
+        """
+        clone = copy.copy(self)
+        clone.playable_area = self.playable_area.copy()
+        clone.regions = self.regions.copy()
+        clone.area_surface = None
+        clone.near_border = None
+        clone.occupancy = None
+        return clone
+    
+    def _enemy_windows(self, enemy_positions):
+        """Ventanas 3x3 (recortadas al grid) alrededor de cada enemigo (posiciones en celdas)"""
+        for enemy_area_x, enemy_area_y in enemy_positions:
+            x0 = max(0, enemy_area_x - 1)
+            y0 = max(0, enemy_area_y - 1)
+            x1 = min(self.grid_width, enemy_area_x + 2)
+            y1 = min(self.grid_height, enemy_area_y + 2)
+            if x0 < x1 and y0 < y1:
+                yield slice(y0, y1), slice(x0, x1)
+    
+    def mask_contains_enemies(self, mask, enemy_positions):
+        """Verifica si una máscara booleana [y, x] contiene enemigos"""
+        return any(mask[window].any() for window in self._enemy_windows(enemy_positions))
+    
+    def labels_near_enemies(self, labels, enemy_positions):
+        """Devuelve las etiquetas de las áreas que contienen enemigos"""
+        enemy_labels = set()
+        for window in self._enemy_windows(enemy_positions):
+            enemy_labels.update(np.unique(labels[window]).tolist())
+        enemy_labels.discard(0)
+        return enemy_labels
+    
+    def _component_mask(self, labels, component):
+        """Máscara [y, x] de una componente, del tamaño de su caja"""
+        min_x, min_y, max_x, max_y = component.bbox
+        return labels[min_y:max_y + 1, min_x:max_x + 1] == component.label
+    
+    def _apply_cut(self, cut_mask, rect):
+        """Aplica el corte eliminando las celdas marcadas en la máscara.
+        
+        rect = (min_x, min_y, max_x, max_y) contiene todas las celdas marcadas;
+        cut_mask es la máscara [y, x] de ese rectángulo.
+        """
+        return self.commit_cut(self._prepare_cut(cut_mask, rect))
+    
+    def _near_border_patch_steps(self, removed, rect):
+        """Zona a border_threshold o menos de las celdas eliminadas: ((x0, y0, x1, y1), máscara)"""
+        radius = self.border_threshold
+        min_x, min_y, max_x, max_y = rect
+        dilated = yield from _dilate_square_steps(removed, radius)
+        
+        # dilated cubre el rectángulo ampliado en radius; recortarlo al grid
+        x0, y0 = max(0, min_x - radius), max(0, min_y - radius)
+        x1, y1 = min(self.grid_width - 1, max_x + radius), min(self.grid_height - 1, max_y + radius)
+        dx, dy = x0 - (min_x - radius), y0 - (min_y - radius)
+        return (x0, y0, x1, y1), dilated[dy:dy + y1 - y0 + 1, dx:dx + x1 - x0 + 1]
+    
     def _find_closest_border_point(self, point):
-        """Encuentra el punto de borde más cercano"""
+        """Encuentra el punto de borde más cercano (en celdas)"""
         x, y = point
+        width, height = self.grid_width, self.grid_height
         
         # Distancias a cada borde
         dist_left = x
-        dist_right = self.width - 1 - x
+        dist_right = width - 1 - x
         dist_top = y
-        dist_bottom = self.height - 1 - y
+        dist_bottom = height - 1 - y
         
         min_dist = min(dist_left, dist_right, dist_top, dist_bottom)
         
         if min_dist == dist_left:
             return (0, y)
         elif min_dist == dist_right:
-            return (self.width - 1, y)
+            return (width - 1, y)
         elif min_dist == dist_top:
             return (x, 0)
         else:
-            return (x, self.height - 1)
+            return (x, height - 1)
     
     def is_position_valid(self, x, y):
-        """Verifica si una posición está en el área de juego válida"""
+        """Verifica si una posición (píxeles del área) está en el área de juego válida"""
         x, y = int(x), int(y)
         if not (0 <= x < self.width and 0 <= y < self.height):
             return False
-        return self.playable_area[y][x]
+        cell_x, cell_y = self.cells.to_cell(x, y)
+        return bool(self.playable_area[cell_y, cell_x])
+    
+    def positions_valid(self, xs, ys):
+        """is_position_valid para arrays enteros de posiciones dentro del área"""
+        cell_xs, cell_ys = self.cells.to_cells(xs, ys)
+        return self.playable_area[cell_ys, cell_xs]
+    
+    def is_near_border(self, x, y):
+        """Verifica en O(1) si una posición está junto a un borde o a un área cortada"""
+        x, y = int(x), int(y)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        cell_x, cell_y = self.cells.to_cell(x, y)
+        return bool(self.near_border[cell_y, cell_x])
+    
+    def count_valid(self, x0, y0, x1, y1):
+        """Píxeles válidos del rectángulo inclusivo (contando enteras las celdas que toca)"""
+        return self.occupancy.count(self.cells.to_cell_rect(x0, y0, x1, y1)) * self.cell_area
+    
+    def any_valid(self, x0, y0, x1, y1):
+        """Verifica si queda alguna posición válida en el rectángulo inclusivo"""
+        return self.occupancy.any(self.cells.to_cell_rect(x0, y0, x1, y1))
+    
+    def nearest_valid(self, x, y):
+        """Posición válida (píxeles del área) más cercana a (x, y), o None si no queda ninguna"""
+        found = self.occupancy.nearest(*self.to_cell(x, y))
+        if found is None:
+            return None
+        x, y = self.cells.to_pixel(*found, centered=True)
+        return min(x, self.width - 1), min(y, self.height - 1)
     
     def get_safe_spawn_position(self, margin=50):
         """Obtiene una posición segura para spawn de objetos"""
@@ -295,16 +605,25 @@ class AreaManager:
         if self.is_position_valid(center_x, center_y):
             return center_x, center_y
         
-        # Último recurso: buscar cualquier posición válida
-        for y in range(margin, self.height - margin):
-            for x in range(margin, self.width - margin):
-                if self.is_position_valid(x, y):
-                    return x, y
+        # Último recurso: la primera posición válida dentro del margen, en orden
+        # de barrido (el índice de ocupación salta los bloques cortados)
+        # (celdas cuya esquina superior izquierda queda dentro del margen)
+        inner_margin = self.cells.cells_for(margin)
+        found = self.occupancy.first((inner_margin, inner_margin) +
+                                     self.to_cell(self.width - margin - 1, self.height - margin - 1))
+        if found is not None:
+            return self.cells.to_pixel(*found)
+        
+        # Sin sitio dentro del margen: la posición válida más cercana al centro
+        nearest = self.nearest_valid(center_x, center_y)
+        if nearest is not None:
+            return nearest
         
         return self.width // 2, self.height // 2  # Posición por defecto
     
     def get_cut_percentage(self):
         """Devuelve el porcentaje de área cortada"""
+        # cut_pixels se mantiene en commit_cut con los píxeles de las celdas eliminadas
         return (self.cut_pixels / self.total_pixels) * 100
     
     def draw(self, screen, offset_x=0, offset_y=0):
@@ -317,7 +636,9 @@ class Player:
         self.y = y
         self.size = PLAYER_SIZE
         self.speed = PLAYER_SPEED
-        self.trail = []
+        # Trail simplificado y acotado; los últimos 8 puntos (los más cercanos
+        # al jugador) se guardan sin simplificar y no colisionan
+        self.trail = TrailBuffer(safe_points=8)
         self.cutting = False
         self.start_cut_pos = None
         self.on_border = True
@@ -334,7 +655,11 @@ class Player:
         self.area_offset_x = offset_x
         self.area_offset_y = offset_y
         
-    def update(self, keys, game_area, area_manager):
+    def update(self, keys, game_area, area_manager, now=None):
+        # now: tiempo en ms (por defecto el reloj de pygame)
+        if now is None:
+            now = pygame.time.get_ticks()
+        
         # Actualizar tiempo de invulnerabilidad
         if self.invulnerable_time > 0:
             self.invulnerable_time -= 1
@@ -366,7 +691,7 @@ class Player:
         else:
             # Si no puede moverse, cancelar el corte actual
             if self.cutting:
-                print("Posición inválida durante corte - cancelando")
+                log.debug("Posición inválida durante corte - cancelando")
                 self.reset_cut()
         
         # Verificar movimiento
@@ -385,13 +710,14 @@ class Player:
                 # Empezar corte desde el borde
                 self.cutting = True
                 self.start_cut_pos = (area_center_x, area_center_y)
-                self.trail = [(area_center_x, area_center_y)]
-                self.last_trail_update = pygame.time.get_ticks()
-                print(f"Iniciando corte desde ({area_center_x}, {area_center_y})")
+                self.trail.clear()
+                self.trail.append(area_center_x, area_center_y)
+                self.last_trail_update = now
+                log.debug("Iniciando corte desde (%d, %d)", area_center_x, area_center_y)
                 
             elif self.cutting:
                 # Continuar corte
-                current_time = pygame.time.get_ticks()
+                current_time = now
                 
                 # Añadir punto al trail si ha pasado suficiente tiempo y distancia
                 if current_time - self.last_trail_update > 20:  # 20ms entre puntos
@@ -401,12 +727,13 @@ class Player:
                     if (not self.trail or 
                         math.sqrt((trail_x - self.trail[-1][0])**2 + 
                                  (trail_y - self.trail[-1][1])**2) >= self.min_trail_distance):
-                        self.trail.append((trail_x, trail_y))
+                        self.trail.append(trail_x, trail_y)
                         self.last_trail_update = current_time
                 
                 # Completar corte si regresa al borde
-                if on_border_now and len(self.trail) >= 4:
-                    print(f"Completando corte con {len(self.trail)} puntos")
+                if on_border_now and self.trail.raw_count >= 4:
+                    log.debug("Completando corte con %d puntos (%d tras simplificar)",
+                              self.trail.raw_count, len(self.trail))
                     completed_trail = self.complete_cut()
                     if completed_trail:
                         self.on_border = on_border_now
@@ -418,36 +745,19 @@ class Player:
     
     def is_on_border(self, x, y, area_manager):
         """Verifica si el jugador está en el borde del área válida"""
-        x, y = int(x), int(y)
-        border_threshold = 8  # Umbral más amplio para facilitar el juego
-        
-        # Verificar bordes del área de juego
-        if (x <= border_threshold or x >= area_manager.width - border_threshold - 1 or 
-            y <= border_threshold or y >= area_manager.height - border_threshold - 1):
-            return True
-        
-        # Verificar proximidad a áreas cortadas
-        for dx in range(-border_threshold, border_threshold + 1):
-            for dy in range(-border_threshold, border_threshold + 1):
-                check_x = x + dx
-                check_y = y + dy
-                
-                if (0 <= check_x < area_manager.width and 
-                    0 <= check_y < area_manager.height):
-                    if not area_manager.is_position_valid(check_x, check_y):
-                        return True
-        
-        return False
+        # Umbral de BORDER_THRESHOLD píxeles hasta el borde o un área cortada,
+        # precalculado por el área manager
+        return area_manager.is_near_border(x, y)
     
     def complete_cut(self):
         """Completa un corte y devuelve los puntos del trail"""
-        if len(self.trail) < 4:
-            print(f"Trail muy corto: {len(self.trail)} puntos")
+        if self.trail.raw_count < 4:
+            log.debug("Trail muy corto: %d puntos", self.trail.raw_count)
             self.reset_cut()
             return None
         
-        # Crear una copia del trail para el corte
-        trail_copy = self.trail.copy()
+        # Copia de la polilínea simplificada para el corte
+        trail_copy = self.trail.points()
         
         # Asegurar que el polígono esté cerrado conectando al borde más cercano
         last_point = trail_copy[-1]
@@ -456,7 +766,7 @@ class Player:
         if border_point and border_point != last_point:
             trail_copy.append(border_point)
         
-        print(f"Trail completado con {len(trail_copy)} puntos")
+        log.debug("Trail completado con %d puntos", len(trail_copy))
         self.reset_cut()
         return trail_copy
     
@@ -496,14 +806,17 @@ class Player:
     
     def hit(self):
         """Maneja cuando el jugador es golpeado"""
-        self.invulnerable_time = 120  # 2 segundos a 60 FPS
+        self.invulnerable_time = 2 * TICK_RATE  # 2 segundos
         self.reset_cut()
     
     def is_invulnerable(self):
         """Verifica si el jugador está en período de invulnerabilidad"""
         return self.invulnerable_time > 0
     
-    def draw(self, screen):
+    def draw(self, screen, position=None):
+        # position: posición interpolada para el render (por defecto la actual)
+        x, y = position or (self.x, self.y)
+        
         # Dibujar el trail de corte
         if len(self.trail) > 1 and self.cutting:
             screen_trail = [(x + self.area_offset_x, y + self.area_offset_y) for x, y in self.trail]
@@ -513,7 +826,7 @@ class Player:
                 # Línea desde el último punto hasta el jugador
                 if screen_trail:
                     last_pos = screen_trail[-1]
-                    current_pos = (self.x + self.size // 2, self.y + self.size // 2)
+                    current_pos = (x + self.size // 2, y + self.size // 2)
                     pygame.draw.line(screen, ORANGE, last_pos, current_pos, 2)
         
         # Dibujar el jugador
@@ -523,14 +836,14 @@ class Player:
         if self.is_invulnerable() and (self.invulnerable_time // 5) % 2 == 0:
             color = (color[0] // 2, color[1] // 2, color[2] // 2)
         
-        pygame.draw.rect(screen, color, (self.x, self.y, self.size, self.size))
-        pygame.draw.rect(screen, WHITE, (self.x, self.y, self.size, self.size), 2)
+        pygame.draw.rect(screen, color, (x, y, self.size, self.size))
+        pygame.draw.rect(screen, WHITE, (x, y, self.size, self.size), 2)
         
         # Indicador de corte
         if self.cutting:
             if (pygame.time.get_ticks() // 200) % 2 == 0:
                 pygame.draw.circle(screen, YELLOW, 
-                                 (self.x + self.size//2, self.y - 10), 3)
+                                 (x + self.size//2, y - 10), 3)
 
 class Enemy:
     def __init__(self, x, y, enemy_type="bouncer"):
@@ -573,8 +886,8 @@ class Enemy:
             self.stuck_counter = 0
         
         # Si está atascado, reubicarlo
-        if self.stuck_counter > 60:  # 1 segundo a 60 FPS
-            self._relocate_if_stuck(game_area, area_manager)
+        if self.stuck_counter > TICK_RATE:  # 1 segundo
+            self.relocate(area_manager)
             self.stuck_counter = 0
         
         self.last_position = current_pos
@@ -586,8 +899,12 @@ class Enemy:
         elif self.type == "fast":
             self._bouncer_behavior(game_area, area_manager)
     
-    def _relocate_if_stuck(self, game_area, area_manager):
-        """Reubica el enemigo si está atascado"""
+    def relocate(self, area_manager):
+        """Reubica el enemigo en una posición segura con una dirección aleatoria.
+        
+        Se usa cuando lleva un segundo atascado y cuando un corte aplicado
+        elimina el área en la que está.
+        """
         area_x, area_y = area_manager.get_safe_spawn_position()
         self.x = area_x + self.game_area_offset_x - self.size // 2
         self.y = area_y + self.game_area_offset_y - self.size // 2
@@ -595,7 +912,7 @@ class Enemy:
         # Cambiar dirección aleatoriamente
         self.direction_x = random.choice([-1, 1])
         self.direction_y = random.choice([-1, 1])
-        print(f"Enemigo reubicado a ({self.x}, {self.y})")
+        log.debug("Enemigo reubicado a (%s, %s)", self.x, self.y)
     
     def _bouncer_behavior(self, game_area, area_manager):
         """Comportamiento básico de rebote mejorado"""
@@ -669,7 +986,7 @@ class Enemy:
         target_x, target_y = player.x, player.y
         
         # Si el jugador está cortando, perseguir su trail
-        if player.cutting and player.trail and len(player.trail) > 3:
+        if player.cutting and player.trail.raw_count > 3:
             min_dist = float('inf')
             for trail_point in player.trail[-5:]:  # Últimos 5 puntos
                 trail_screen_x = trail_point[0] + player.area_offset_x
@@ -753,9 +1070,11 @@ class Enemy:
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.size, self.size)
     
-    def draw(self, screen):
-        center_x = int(self.x + self.size // 2)
-        center_y = int(self.y + self.size // 2)
+    def draw(self, screen, position=None):
+        # position: posición interpolada para el render (por defecto la actual)
+        x, y = position or (self.x, self.y)
+        center_x = int(x + self.size // 2)
+        center_y = int(y + self.size // 2)
         pygame.draw.circle(screen, self.color, (center_x, center_y), self.size // 2)
         pygame.draw.circle(screen, WHITE, (center_x, center_y), self.size // 2, 2)
         
@@ -764,11 +1083,22 @@ class Enemy:
             pygame.draw.circle(screen, YELLOW, (center_x, center_y - 15), 3)
 
 class Game:
-    def __init__(self, screen, settings=None):
-        self.screen = screen
-        self.settings = settings or {'volume': 100, 'difficulty': 'Normal'}
+    def __init__(self, screen, settings=None, input_source=None, time_source=None, profiler=None,
+                 cut_mode=None, cell_size=None):
+        self.screen = screen  # None en modo headless (no se llama a draw)
+        self.settings = settings or dict(DEFAULT_SETTINGS)
         self.state = GameState.PLAYING
         
+        # Fuentes de entrada y tiempo: teclado y reloj de pygame por defecto,
+        # sustituibles por entrada programada y reloj simulado (ver headless.py)
+        self.input_source = input_source or pygame.key
+        # Tiempo de simulación en ms: avanza un tick de 1/TICK_RATE s por update()
+        self.ticks = 0
+        self.time_source = time_source or self._simulation_time
+        
+        # Instrumentación de tiempos por fase (se activa junto con el modo debug)
+        self.profiler = profiler or FrameProfiler()
+        
         # Área de juego (dejando espacio para UI)
         ui_height = 100
         self.game_area = {
@@ -779,7 +1109,17 @@ class Game:
         }
         
         # Inicializar sistema de áreas
-        self.area_manager = AreaManager(self.game_area['width'], self.game_area['height'])
+        # cell_size: píxeles por lado de cada celda del grid lógico
+        self.cell_size = cell_size or AREA_CELL_SIZE
+        self.area_manager = AreaManager(self.game_area['width'], self.game_area['height'],
+                                        self.cell_size)
+        
+        # Cortes calculados por un worker y aplicados en un tick posterior;
+        # cut_commit_gate decide en qué tick (replay lo fija a los ticks grabados)
+        self.cut_worker = CutWorker(cut_mode or CUT_MODE)
+        self.cut_commit_gate = self.cut_worker.done
+        self.pending_trails = deque()
+        self.cuts_committed = 0
         
         # Inicializar jugador en el borde
         start_x = self.game_area['x']
@@ -789,6 +1129,12 @@ class Game:
         
         # Inicializar enemigos según dificultad
         self.enemies = self._create_enemies()
+        self.enemy_batch = EnemyBatch()
+        
+        # Posiciones al inicio del último tick, para interpolar el render
+        self._previous_player = (self.player.x, self.player.y)
+        self._previous_enemies = None
+        self._previous_positions = []
         
         # Variables del juego
         self.score = 0
@@ -797,14 +1143,20 @@ class Game:
         self.target_area = TARGET_AREA_PERCENTAGE
         
         # UI
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = get_font(36)
+        self.small_font = get_font(24)
+        self.large_font = get_font(72)
         
         # Efectos visuales
-        self.particles = []
+        self.particles = ParticleSystem()
         
         # Variables de debug
         self.debug_mode = False
+        
+        # Composición guardada de los overlays (pausa, game over, nivel completado)
+        self._overlay_surface = None
+        self._overlay_key = None
+        self._overlay_presented = False
     
     def _create_enemies(self):
         """Crea enemigos según la dificultad"""
@@ -836,7 +1188,7 @@ class Game:
             enemy = Enemy(screen_x, screen_y, enemy_type)
             enemies.append(enemy)
             
-            print(f"Enemigo {enemy_type} creado en ({screen_x}, {screen_y})")
+            log.debug("Enemigo %s creado en (%s, %s)", enemy_type, screen_x, screen_y)
         
         return enemies
     
@@ -852,63 +1204,63 @@ class Game:
                 self._next_level()
             elif event.key == pygame.K_F1:  # Toggle debug mode
                 self.debug_mode = not self.debug_mode
-                print(f"Debug mode: {'ON' if self.debug_mode else 'OFF'}")
+                self.profiler.enabled = self.debug_mode
+                # En modo debug se muestran también los mensajes de depuración
+                logger.set_level(logger.DEBUG if self.debug_mode else logger.DEFAULT_LEVEL)
+                log.info("Debug mode: %s", 'ON' if self.debug_mode else 'OFF')
         
         return None
     
+    def _simulation_time(self):
+        return self.ticks * 1000 // TICK_RATE
+    
     def update(self):
+        """Avanza un tick fijo de simulación (1/TICK_RATE s)"""
         if self.state != GameState.PLAYING:
             return
         
-        keys = pygame.key.get_pressed()
+        self.ticks += 1
+        self._previous_player = (self.player.x, self.player.y)
+        self._previous_enemies = self.enemies
+        self._previous_positions = [(enemy.x, enemy.y) for enemy in self.enemies]
+        
+        profiler = self.profiler
+        keys = self.input_source.get_pressed()
         
         # Actualizar jugador y obtener trail si completa corte
-        completed_trail = self.player.update(keys, self.game_area, self.area_manager)
+        started = profiler.start()
+        completed_trail = self.player.update(keys, self.game_area, self.area_manager,
+                                             self.time_source())
+        profiler.stop('update.player', started)
+        
         if completed_trail:
-            print(f"Trail completado con {len(completed_trail)} puntos")
-            
-            if self.debug_mode:
-                print("Posiciones de enemigos:")
-                for i, enemy in enumerate(self.enemies):
-                    area_x, area_y = enemy.get_area_position()
-                    print(f"  Enemigo {i}: pantalla({enemy.x:.1f}, {enemy.y:.1f}) -> área({area_x}, {area_y})")
-            
-            # Procesar el corte
-            pixels_cut = self.area_manager.cut_area_with_trail(completed_trail, self.enemies)
-            if pixels_cut > 0:
-                points_earned = pixels_cut * POINTS_PER_AREA
-                self.score += points_earned
-                print(f"¡Área cortada! +{points_earned} puntos ({pixels_cut} píxeles)")
-                
-                # Crear partículas de éxito
-                for _ in range(15):
-                    self.particles.append({
-                        'x': self.player.x + random.randint(-20, 20),
-                        'y': self.player.y + random.randint(-20, 20),
-                        'vx': random.uniform(-3, 3),
-                        'vy': random.uniform(-3, 3),
-                        'life': 60,
-                        'color': YELLOW
-                    })
-            else:
-                print("No se cortó ningún área")
+            log.debug("Trail completado con %d puntos", len(completed_trail))
+            self.pending_trails.append(completed_trail)
+        
+        # Lanzar y aplicar cortes calculados en segundo plano
+        started = profiler.start()
+        self._process_cuts()
+        profiler.stop('update.cut', started)
         
         # Actualizar enemigos
-        for enemy in self.enemies:
-            enemy.update(self.game_area, self.area_manager, self.player)
+        started = profiler.start()
+        if len(self.enemies) >= ENEMY_BATCH_THRESHOLD:
+            self.enemy_batch.update(self.enemies, self.game_area, self.area_manager, self.player)
+        else:
+            for enemy in self.enemies:
+                enemy.update(self.game_area, self.area_manager, self.player)
+        profiler.stop('update.enemies', started)
         
         # Verificar colisiones solo si el jugador no está invulnerable
+        started = profiler.start()
         if not self.player.is_invulnerable():
             self._check_collisions()
+        profiler.stop('update.collisions', started)
         
         # Actualizar partículas
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.1  # Gravedad
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        started = profiler.start()
+        self.particles.update()
+        profiler.stop('update.particles', started)
         
         # Verificar condiciones de victoria/derrota
         area_cut = self.area_manager.get_cut_percentage()
@@ -918,6 +1270,82 @@ class Game:
         elif self.lives <= 0:
             self.state = GameState.GAME_OVER
 
+    def _process_cuts(self):
+        """Envía el siguiente trail al worker y aplica el corte pendiente si está listo.
+        
+        El corte se calcula con las posiciones de los enemigos al enviarlo y se
+        aplica en el primer tick en que cut_commit_gate() lo permite (en modo
+        'sync', el mismo tick). Los trails completados mientras tanto esperan
+        en pending_trails.
+        """
+        worker = self.cut_worker
+        if not worker.busy and self.pending_trails:
+            self._submit_cut(self.pending_trails.popleft())
+        worker.advance()  # Solo en modo 'sliced': reparte el cálculo entre ticks
+        if worker.busy and self.cut_commit_gate():
+            self._commit_cut(worker.result())
+            if self.pending_trails:
+                self._submit_cut(self.pending_trails.popleft())
+    
+    def _submit_cut(self, trail):
+        enemy_positions = [enemy.get_area_position() for enemy in self.enemies]
+        if log.debug_enabled:
+            log.debug("Posiciones de enemigos:")
+            for i, (enemy, (area_x, area_y)) in enumerate(zip(self.enemies, enemy_positions)):
+                log.debug("  Enemigo %d: pantalla(%.1f, %.1f) -> área(%d, %d)",
+                          i, enemy.x, enemy.y, area_x, area_y)
+        self.cut_worker.submit(self.area_manager, trail, enemy_positions)
+    
+    def _commit_cut(self, plan):
+        """Aplica un corte calculado y puntúa.
+        
+        Regla para lo que se movió mientras se calculaba: los enemigos cuyo
+        centro cae en el área eliminada se reubican en una posición segura, y
+        si el jugador queda encerrado en ella vuelve al borde (perdiendo el
+        corte en curso).
+        """
+        self.cuts_committed += 1
+        pixels_cut = self.area_manager.commit_cut(plan)
+        if pixels_cut == 0:
+            log.debug("No se cortó ningún área")
+            return
+        
+        for enemy in self.enemies:
+            if plan.covers(*enemy.get_area_position()):
+                enemy.relocate(self.area_manager)
+        
+        player = self.player
+        if self._player_trapped():
+            player.reset_cut()
+            player.x, player.y = self._safe_player_position()
+            player.on_border = True
+        
+        points_earned = pixels_cut * POINTS_PER_AREA
+        self.score += points_earned
+        log.info("¡Área cortada! +%d puntos (%d píxeles)", points_earned, pixels_cut)
+        
+        # Crear partículas de éxito
+        self.particles.emit(15, player.x, player.y, speed=3,
+                            life=60, color=YELLOW, spread=20)
+    
+    def _player_trapped(self):
+        """Verifica si ningún paso del jugador (ni quedarse quieto) cae en área válida"""
+        player = self.player
+        center_x = int(player.x + player.size // 2 - player.area_offset_x)
+        center_y = int(player.y + player.size // 2 - player.area_offset_y)
+        step = player.speed
+        return not any(self.area_manager.is_position_valid(center_x + dx, center_y + dy)
+                       for dx in (-step, 0, step) for dy in (-step, 0, step))
+    
+    def _cancel_cuts(self):
+        """Descarta los cortes pendientes (el área se va a reemplazar)"""
+        self.cut_worker.cancel()
+        self.pending_trails.clear()
+    
+    def shutdown(self):
+        """Libera el worker de cortes"""
+        self.cut_worker.shutdown()
+    
     def _check_collisions(self):
         """Verifica colisiones entre jugador y enemigos"""
         player_rect = pygame.Rect(self.player.x, self.player.y, self.player.size, self.player.size)
@@ -928,24 +1356,16 @@ class Game:
                 return
         
         # Verificar colisiones con el trail si está cortando
-        if self.player.cutting and len(self.player.trail) > 10:
+        if self.player.cutting and self.player.trail.raw_count > 10:
+            # Solo colisiona la parte antigua del trail (excluye los últimos 8 puntos)
+            trail = self.player.trail
             for enemy in self.enemies:
-                enemy_center = (enemy.x + enemy.size//2, enemy.y + enemy.size//2)
-                
-                # Verificar colisión con los primeros puntos del trail (excluyendo los últimos)
-                trail_to_check = self.player.trail[:-8]  # Excluir últimos 8 puntos
+                enemy_area_x = enemy.x + enemy.size // 2 - self.player.area_offset_x
+                enemy_area_y = enemy.y + enemy.size // 2 - self.player.area_offset_y
                 
-                for trail_point in trail_to_check:
-                    trail_screen_x = trail_point[0] + self.player.area_offset_x
-                    trail_screen_y = trail_point[1] + self.player.area_offset_y
-                    
-                    dist = math.sqrt(
-                        (enemy_center[0] - trail_screen_x)**2 + 
-                        (enemy_center[1] - trail_screen_y)**2
-                    )
-                    if dist < (enemy.size // 2 + 5):  # Radio de colisión
-                        self._player_hit()
-                        return
+                if trail.hits_circle(enemy_area_x, enemy_area_y, enemy.size // 2 + 5):  # Radio de colisión
+                    self._player_hit()
+                    return
     
     def _player_hit(self):
         """Maneja cuando el jugador es golpeado"""
@@ -953,6 +1373,18 @@ class Game:
         self.player.hit()
         
         # Mover jugador a una posición segura en el borde
+        self.player.x, self.player.y = self._safe_player_position()
+        self.player.on_border = True
+        
+        # Crear efecto de partículas
+        self.particles.emit(20, self.player.x + self.player.size // 2,
+                            self.player.y + self.player.size // 2, speed=8,
+                            life=45, color=RED)
+        
+        log.info("¡Golpeado! Vidas restantes: %d", self.lives)
+    
+    def _safe_player_position(self):
+        """Punto medio de un lado del área, el más alejado de los enemigos"""
         safe_positions = [
             (self.game_area['x'], self.game_area['y'] + self.game_area['height'] // 2),
             (self.game_area['x'] + self.game_area['width'] - self.player.size, 
@@ -976,21 +1408,7 @@ class Game:
                 max_min_distance = min_distance_to_enemies
                 best_pos = pos
         
-        self.player.x, self.player.y = best_pos
-        self.player.on_border = True
-        
-        # Crear efecto de partículas
-        for _ in range(20):
-            self.particles.append({
-                'x': self.player.x + self.player.size // 2,
-                'y': self.player.y + self.player.size // 2,
-                'vx': random.uniform(-8, 8),
-                'vy': random.uniform(-8, 8),
-                'life': 45,
-                'color': RED
-            })
-        
-        print(f"¡Golpeado! Vidas restantes: {self.lives}")
+        return best_pos
     
     def _next_level(self):
         """Avanza al siguiente nivel"""
@@ -998,7 +1416,9 @@ class Game:
         self.state = GameState.PLAYING
         
         # Reinicializar el sistema de áreas
-        self.area_manager = AreaManager(self.game_area['width'], self.game_area['height'])
+        self._cancel_cuts()
+        self.area_manager = AreaManager(self.game_area['width'], self.game_area['height'],
+                                        self.cell_size)
         
         # Resetear jugador
         self.player.x = self.game_area['x']
@@ -1020,7 +1440,7 @@ class Game:
             self.enemies.append(Enemy(new_enemy_x, new_enemy_y, "hunter"))
         
         self.particles.clear()
-        print(f"¡Nivel {self.level}! Dificultad incrementada.")
+        log.info("¡Nivel %d! Dificultad incrementada.", self.level)
     
     def _restart_game(self):
         """Reinicia el juego"""
@@ -1030,7 +1450,9 @@ class Game:
         self.level = 1
         
         # Reinicializar el sistema de áreas
-        self.area_manager = AreaManager(self.game_area['width'], self.game_area['height'])
+        self._cancel_cuts()
+        self.area_manager = AreaManager(self.game_area['width'], self.game_area['height'],
+                                        self.cell_size)
         
         # Resetear jugador
         self.player.x = self.game_area['x']
@@ -1043,7 +1465,28 @@ class Game:
         self.enemies = self._create_enemies()
         self.particles.clear()
     
-    def draw(self):
+    def draw(self, alpha=1.0):
+        """Dibuja el frame; alpha (0-1) es la fracción del tick en curso ya transcurrida"""
+        if self.state != GameState.PLAYING:
+            self._draw_frozen_overlay()
+            return
+        
+        self._overlay_key = None
+        self._draw_scene(alpha=alpha)
+    
+    @staticmethod
+    def _interpolate(previous, x, y, alpha):
+        """Posición entre el tick anterior y el actual (los saltos no se interpolan)"""
+        previous_x, previous_y = previous
+        if abs(x - previous_x) > 32 or abs(y - previous_y) > 32:  # Reaparición o reubicación
+            return x, y
+        return previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha
+    
+    def _draw_scene(self, debug=True, alpha=1.0):
+        """Dibuja área, sprites, partículas e interfaz"""
+        profiler = self.profiler
+        
+        started = profiler.start()
         self.screen.fill(BLACK)
         
         # Dibujar área de juego base
@@ -1058,34 +1501,76 @@ class Game:
         pygame.draw.rect(self.screen, WHITE,
                         (self.game_area['x'], self.game_area['y'],
                          self.game_area['width'], self.game_area['height']), 3)
+        profiler.stop('draw.area', started)
         
         # Dibujar enemigos
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        started = profiler.start()
+        if alpha < 1.0 and self._previous_enemies is self.enemies:
+            for enemy, previous in zip(self.enemies, self._previous_positions):
+                enemy.draw(self.screen, self._interpolate(previous, enemy.x, enemy.y, alpha))
+        else:
+            for enemy in self.enemies:
+                enemy.draw(self.screen)
         
         # Dibujar jugador
-        self.player.draw(self.screen)
+        if alpha < 1.0:
+            self.player.draw(self.screen, self._interpolate(
+                self._previous_player, self.player.x, self.player.y, alpha))
+        else:
+            self.player.draw(self.screen)
+        profiler.stop('draw.sprites', started)
         
         # Dibujar partículas
-        for particle in self.particles:
-            size = max(1, particle['life'] // 10)  # Tamaño variable
-            pygame.draw.circle(self.screen, particle['color'],
-                             (int(particle['x']), int(particle['y'])), size)
+        started = profiler.start()
+        self.particles.draw(self.screen)
+        profiler.stop('draw.particles', started)
         
         # Dibujar UI
+        started = profiler.start()
         self._draw_ui()
         
         # Información de debug
+        if debug and self.debug_mode:
+            self._draw_debug_info()
+        profiler.stop('draw.ui', started)
+    
+    def _draw_frozen_overlay(self):
+        """Dibuja el overlay del estado actual sobre la escena congelada.
+        
+        La composición (escena + overlay) se construye una vez por cambio de
+        estado y se guarda; después cada frame cuesta un blit, o ninguno si la
+        pantalla ya la muestra.
+        """
+        profiler = self.profiler
+        started = profiler.start()
+        
+        key = (self.state, self.score, self.lives, self.level,
+               id(self.screen), self.screen.get_size())
+        if key != self._overlay_key:
+            self._draw_scene(debug=False)
+            if self.state == GameState.PAUSED:
+                self._draw_pause_overlay()
+            elif self.state == GameState.GAME_OVER:
+                self._draw_game_over_overlay()
+            elif self.state == GameState.LEVEL_COMPLETE:
+                self._draw_level_complete_overlay()
+            self._overlay_surface = self.screen.copy()
+            self._overlay_key = key
+        elif not self._overlay_presented:
+            self.screen.blit(self._overlay_surface, (0, 0))
+        self._overlay_presented = True
+        
+        # La información de debug cambia cada frame: se dibuja encima y obliga
+        # a restaurar la composición en el siguiente
         if self.debug_mode:
             self._draw_debug_info()
-        
-        # Dibujar overlays según el estado
-        if self.state == GameState.PAUSED:
-            self._draw_pause_overlay()
-        elif self.state == GameState.GAME_OVER:
-            self._draw_game_over_overlay()
-        elif self.state == GameState.LEVEL_COMPLETE:
-            self._draw_level_complete_overlay()
+            self._overlay_presented = False
+        profiler.stop('draw.overlay', started)
+    
+    def invalidate_overlay(self):
+        """Descarta la composición guardada (p. ej. al recrear la pantalla)"""
+        self._overlay_key = None
+        self._overlay_surface = None
     
     def _draw_debug_info(self):
         """Dibuja información de debug"""
@@ -1102,14 +1587,28 @@ class Game:
             f"Player area pos: {player_area_pos}",
             f"On border: {self.player.on_border}",
             f"Cutting: {self.player.cutting}",
-            f"Trail points: {len(self.player.trail)}",
+            f"Trail points: {self.player.trail.raw_count} ({len(self.player.trail)} simplified)",
             f"Invulnerable: {self.player.invulnerable_time}",
             f"Enemies: {len(self.enemies)}"
         ]
         
         for i, text in enumerate(debug_texts):
-            debug_surface = self.small_font.render(text, True, YELLOW)
+            debug_surface = render_text(self.small_font, text, YELLOW)
             self.screen.blit(debug_surface, (WINDOW_WIDTH - 300, debug_y + i * 20))
+        
+        # Tiempos por fase (ms) de la ventana deslizante del profiler, en columnas
+        profile_y = debug_y + (len(debug_texts) + 1) * 20
+        rows = [("fase", "p50", "p95", "p99", "max")]
+        rows += [(phase,) + tuple(f"{value:.2f}" for value in values)
+                 for phase, *values in self.profiler.report_rows()]
+        for i, row in enumerate(rows):
+            y = profile_y + i * 18
+            name_surface = render_text(self.small_font, row[0], YELLOW)
+            self.screen.blit(name_surface, (WINDOW_WIDTH - 420, y))
+            for column, text in enumerate(row[1:]):
+                value_surface = render_text(self.small_font, text, YELLOW)
+                right = WINDOW_WIDTH - 240 + column * 55
+                self.screen.blit(value_surface, (right - value_surface.get_width(), y))
     
     def _draw_ui(self):
         """Dibuja la interfaz de usuario"""
@@ -1118,13 +1617,13 @@ class Game:
         pygame.draw.line(self.screen, WHITE, (0, 80), (WINDOW_WIDTH, 80), 2)
         
         # Información del juego
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
-        level_text = self.font.render(f"Level: {self.level}", True, WHITE)
+        score_text = render_text(self.font, f"Score: {self.score}", WHITE)
+        lives_text = render_text(self.font, f"Lives: {self.lives}", WHITE)
+        level_text = render_text(self.font, f"Level: {self.level}", WHITE)
         
         # Obtener porcentaje actual de área cortada
         current_area = self.area_manager.get_cut_percentage()
-        area_text = self.font.render(f"Cut: {current_area:.1f}%", True, WHITE)
+        area_text = render_text(self.font, f"Cut: {current_area:.1f}%", WHITE)
         
         self.screen.blit(score_text, (20, 20))
         self.screen.blit(lives_text, (200, 20))
@@ -1149,18 +1648,18 @@ class Game:
                         (progress_x, progress_y, progress_width, 30), 2)
         
         # Texto de objetivo
-        target_text = self.small_font.render(f"Target: {self.target_area}%", True, WHITE)
+        target_text = render_text(self.small_font, f"Target: {self.target_area}%", WHITE)
         self.screen.blit(target_text, (progress_x, progress_y + 35))
         
         # Mostrar estado de invulnerabilidad
         if self.player.is_invulnerable():
-            invul_time = self.player.invulnerable_time / 60.0
-            invul_text = self.small_font.render(f"INVULNERABLE ({invul_time:.1f}s)", True, YELLOW)
+            invul_time = self.player.invulnerable_time / TICK_RATE
+            invul_text = render_text(self.small_font, f"INVULNERABLE ({invul_time:.1f}s)", YELLOW)
             self.screen.blit(invul_text, (20, 50))
         
         # Mostrar controles de debug
         if self.debug_mode:
-            debug_text = self.small_font.render("DEBUG MODE (F1 to toggle)", True, YELLOW)
+            debug_text = render_text(self.small_font, "DEBUG MODE (F1 to toggle)", YELLOW)
             self.screen.blit(debug_text, (WINDOW_WIDTH - 250, 10))
     
     def _draw_pause_overlay(self):
@@ -1170,12 +1669,11 @@ class Game:
         overlay.fill(BLACK)
         self.screen.blit(overlay, (0, 0))
         
-        pause_font = pygame.font.Font(None, 72)
-        pause_text = pause_font.render("PAUSED", True, YELLOW)
+        pause_text = render_text(self.large_font, "PAUSED", YELLOW)
         pause_rect = pause_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
         self.screen.blit(pause_text, pause_rect)
         
-        info_text = self.font.render("Press P to continue", True, WHITE)
+        info_text = render_text(self.font, "Press P to continue", WHITE)
         info_rect = info_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 80))
         self.screen.blit(info_text, info_rect)
     
@@ -1186,16 +1684,15 @@ class Game:
         overlay.fill(BLACK)
         self.screen.blit(overlay, (0, 0))
         
-        game_over_font = pygame.font.Font(None, 72)
-        game_over_text = game_over_font.render("GAME OVER", True, RED)
+        game_over_text = render_text(self.large_font, "GAME OVER", RED)
         game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 50))
         self.screen.blit(game_over_text, game_over_rect)
         
-        score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
+        score_text = render_text(self.font, f"Final Score: {self.score}", WHITE)
         score_rect = score_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 20))
         self.screen.blit(score_text, score_rect)
         
-        restart_text = self.font.render("Press R to restart or ESC for menu", True, WHITE)
+        restart_text = render_text(self.font, "Press R to restart or ESC for menu", WHITE)
         restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 70))
         self.screen.blit(restart_text, restart_rect)
     
@@ -1206,16 +1703,15 @@ class Game:
         overlay.fill(BLACK)
         self.screen.blit(overlay, (0, 0))
         
-        complete_font = pygame.font.Font(None, 72)
-        complete_text = complete_font.render("LEVEL COMPLETE!", True, GREEN)
+        complete_text = render_text(self.large_font, "LEVEL COMPLETE!", GREEN)
         complete_rect = complete_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 50))
         self.screen.blit(complete_text, complete_rect)
         
-        bonus_text = self.font.render(f"Bonus: {self.lives * 1000} points", True, YELLOW)
+        bonus_text = render_text(self.font, f"Bonus: {self.lives * 1000} points", YELLOW)
         bonus_rect = bonus_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 20))
         self.screen.blit(bonus_text, bonus_rect)
         
-        continue_text = self.font.render("Press SPACE to continue", True, WHITE)
+        continue_text = render_text(self.font, "Press SPACE to continue", WHITE)
         continue_rect = continue_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 70))
         self.screen.blit(continue_text, continue_rect)
     
@@ -0,0 +1,187 @@
+# headless.py - Simulación del juego sin ventana y sin límite de FPS
+
+import os
+import sys
+import time
+import random
+import argparse
+import json
+
+import pygame
+from .config import *
+from .game import Game, GameState, Enemy
+
+class KeyState:
+    """Estado de teclado compatible con el resultado de pygame.key.get_pressed()"""
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class ScriptedInput:
+    """Entrada programada que sustituye a pygame.key.get_pressed().
+
+    script es una lista de tramos (ticks, teclas) que se repite en bucle, o
+    una función tick -> teclas. El simulador llama a advance() tras cada tick.
+    """
+    def __init__(self, script=None):
+        self.script = script or [(1, ())]
+        self.tick = 0
+        self._segment = 0
+        self._remaining = None
+        self._current = KeyState()
+        if not callable(self.script):
+            self._load_segment(0)
+
+    def _load_segment(self, index):
+        self._segment = index % len(self.script)
+        ticks, keys = self.script[self._segment]
+        self._remaining = ticks
+        self._current = KeyState(keys)
+
+    def get_pressed(self):
+        if callable(self.script):
+            return KeyState(self.script(self.tick))
+        return self._current
+
+    def advance(self):
+        """Pasa al siguiente tick"""
+        self.tick += 1
+        if not callable(self.script):
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self._load_segment(self._segment + 1)
+
+    @classmethod
+    def random_walk(cls, seed=0, segments=512, hold=(10, 60)):
+        """Paseo aleatorio reproducible: direcciones (y diagonales) mantenidas unos ticks"""
+        rng = random.Random(seed)
+        directions = [
+            (), (pygame.K_LEFT,), (pygame.K_RIGHT,), (pygame.K_UP,), (pygame.K_DOWN,),
+            (pygame.K_LEFT, pygame.K_UP), (pygame.K_LEFT, pygame.K_DOWN),
+            (pygame.K_RIGHT, pygame.K_UP), (pygame.K_RIGHT, pygame.K_DOWN),
+        ]
+        script = [(rng.randint(*hold), rng.choice(directions)) for _ in range(segments)]
+        return cls(script)
+
+class SimulatedClock:
+    """Reloj en ms que avanza un tick de 1/TICK_RATE segundos por paso, no con el tiempo real"""
+    def __init__(self, tick_rate=TICK_RATE):
+        self.tick_rate = tick_rate
+        self.tick = 0
+
+    def __call__(self):
+        return self.tick * 1000 // self.tick_rate
+
+    def advance(self):
+        self.tick += 1
+
+def init_headless():
+    """Inicializa pygame sin ventana (driver de vídeo y audio ficticios)"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+
+def create_headless_game(settings=None, input_source=None, cut_mode='sync', cell_size=None):
+    """Construye un Game sin superficie de pantalla, con entrada y reloj simulados.
+
+    Por defecto los cortes se aplican en el mismo tick ('sync'), para que una
+    misma semilla dé siempre la misma partida. cell_size elige la resolución
+    del grid lógico (por defecto AREA_CELL_SIZE).
+    """
+    init_headless()
+    input_source = input_source or ScriptedInput.random_walk()
+    clock = SimulatedClock()
+    game = Game(None, settings, input_source=input_source, time_source=clock, cut_mode=cut_mode,
+                cell_size=cell_size)
+    return game, input_source, clock
+
+def add_extra_enemies(game, count):
+    """Añade count enemigos con rebote ('bouncer' y 'fast' alternos) para pruebas de carga"""
+    for i in range(count):
+        area_x, area_y = game.area_manager.get_safe_spawn_position()
+        x = area_x + game.game_area['x'] - ENEMY_SIZE // 2
+        y = area_y + game.game_area['y'] - ENEMY_SIZE // 2
+        game.enemies.append(Enemy(x, y, "bouncer" if i % 2 == 0 else "fast"))
+
+def run_simulation(ticks, settings=None, seed=None, input_source=None, soak=False,
+                   extra_enemies=0, cut_mode='sync', cell_size=None):
+    """Ejecuta ticks pasos de Game.update tan rápido como permita la CPU.
+
+    Con soak=True la partida continúa indefinidamente: reinicia tras game over
+    y avanza de nivel al completarlo. extra_enemies añade enemigos con rebote
+    en cada partida o nivel. Devuelve un resumen con los ticks por segundo.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    game, input_source, clock = create_headless_game(settings, input_source, cut_mode, cell_size)
+    add_extra_enemies(game, extra_enemies)
+    restarts = 0
+    levels_completed = 0
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.update()
+        input_source.advance()
+        clock.advance()
+
+        if soak:
+            if game.state == GameState.GAME_OVER:
+                game._restart_game()
+                add_extra_enemies(game, extra_enemies)
+                restarts += 1
+            elif game.state == GameState.LEVEL_COMPLETE:
+                game._next_level()
+                add_extra_enemies(game, extra_enemies)
+                levels_completed += 1
+    elapsed = time.perf_counter() - start
+    game.shutdown()
+
+    return {
+        'ticks': ticks,
+        'elapsed_s': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed > 0 else float('inf'),
+        'score': game.score,
+        'level': game.level,
+        'lives': game.lives,
+        'cut_percentage': game.area_manager.get_cut_percentage(),
+        'cell_size': game.cell_size,
+        'restarts': restarts,
+        'levels_completed': levels_completed,
+        'enemies': len(game.enemies),
+    }
+
+def main(argv=None):
+    """Punto de entrada: python -m scripts.headless"""
+    parser = argparse.ArgumentParser(description="Simulación headless de Gals Panic Remake")
+    parser.add_argument('--ticks', type=int, default=TICK_RATE * 60, help="Ticks a simular")
+    parser.add_argument('--difficulty', default=DEFAULT_SETTINGS['difficulty'],
+                        help="Fácil, Normal, Difícil o Extremo")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla de enemigos y entrada")
+    parser.add_argument('--soak', action='store_true', help="Reiniciar/avanzar nivel sin parar")
+    parser.add_argument('--extra-enemies', type=int, default=0,
+                        help="Enemigos con rebote adicionales (prueba de carga)")
+    parser.add_argument('--cut-mode', default='sync', choices=('sync', 'thread', 'process', 'sliced'),
+                        help="Cálculo de cortes (fuera de 'sync' el resultado depende de la CPU)")
+    parser.add_argument('--cell-size', type=int, default=AREA_CELL_SIZE, choices=(1, 2, 4),
+                        help="Píxeles por celda del grid lógico")
+    parser.add_argument('--output', help="Guardar el resumen en un archivo JSON")
+    args = parser.parse_args(argv)
+
+    settings = dict(DEFAULT_SETTINGS, difficulty=args.difficulty)
+    result = run_simulation(args.ticks, settings, seed=args.seed,
+                            input_source=ScriptedInput.random_walk(args.seed), soak=args.soak,
+                            extra_enemies=args.extra_enemies, cut_mode=args.cut_mode,
+                            cell_size=args.cell_size)
+
+    print(f"{result['ticks']} ticks en {result['elapsed_s']:.2f}s "
+          f"({result['ticks_per_second']:.0f} ticks/s)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
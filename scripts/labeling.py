@@ -0,0 +1,416 @@
+# labeling.py - Etiquetado de componentes conectadas del área de juego
+
+import numpy as np
+from .config import *
+
+# Tramos etiquetados entre dos pausas de los generadores *_steps
+_RUNS_PER_STEP = 2048
+
+def run_steps(steps):
+    """Ejecuta un generador de pasos (*_steps) hasta el final y devuelve su resultado.
+
+    Los generadores *_steps ceden el control (yield sin valor) cada
+    CUT_SLICE_ROWS filas o tramos de trabajo, para repartir un corte entre
+    varios ticks; el resultado es el valor de retorno del generador.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+class ComponentStats:
+    """Resumen de una componente conectada (sin listas de píxeles)"""
+    __slots__ = ('label', 'pixel_count', 'bbox', 'touches_border')
+
+    def __init__(self, label, pixel_count, bbox, touches_border):
+        self.label = label
+        self.pixel_count = pixel_count
+        self.bbox = bbox  # (min_x, min_y, max_x, max_y) inclusivo
+        self.touches_border = touches_border
+
+    def __repr__(self):
+        return (f"ComponentStats(label={self.label}, pixel_count={self.pixel_count}, "
+                f"bbox={self.bbox}, touches_border={self.touches_border})")
+
+def find_runs(grid):
+    """Devuelve (filas, inicios, finales) de los tramos horizontales de True, en orden de barrido"""
+    height, width = grid.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = grid
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)  # Final exclusivo
+    return rows, starts, ends
+
+def _find(parent, i):
+    """Busca la raíz de i comprimiendo el camino"""
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
+
+def union_overlapping_runs(parent, rows, starts, ends):
+    """Une (4-conectividad) los tramos de filas consecutivas que se solapan"""
+    run_steps(union_overlapping_runs_steps(parent, rows, starts, ends))
+
+def union_overlapping_runs_steps(parent, rows, starts, ends):
+    """union_overlapping_runs por pasos: cede el control cada CUT_SLICE_ROWS filas"""
+    run_count = len(rows)
+    if run_count == 0:
+        return
+
+    row_list = rows.tolist()
+    start_list = starts.tolist()
+    end_list = ends.tolist()
+
+    # [prev_begin, prev_end) son los tramos de la fila procesada anteriormente
+    prev_begin = prev_end = 0
+    i = 0
+    rows_done = 0
+    while i < run_count:
+        row = row_list[i]
+        begin = i
+        while i < run_count and row_list[i] == row:
+            i += 1
+        end = i
+
+        if begin > 0 and row_list[begin - 1] == row - 1:
+            # Recorrido en paralelo de los tramos de la fila anterior y la actual
+            a, b = prev_begin, begin
+            while a < prev_end and b < end:
+                if start_list[a] < end_list[b] and start_list[b] < end_list[a]:
+                    root_a = _find(parent, a)
+                    root_b = _find(parent, b)
+                    if root_a != root_b:
+                        if root_a < root_b:
+                            parent[root_b] = root_a
+                        else:
+                            parent[root_a] = root_b
+                if end_list[a] <= end_list[b]:
+                    a += 1
+                else:
+                    b += 1
+
+        prev_begin, prev_end = begin, end
+        rows_done += 1
+        if rows_done % CUT_SLICE_ROWS == 0:
+            yield
+
+def label_components(grid, border_margin=3, offset=(0, 0), board_size=None, workers=None):
+    """Etiqueta las componentes 4-conectadas de un grid booleano [y, x].
+
+    Devuelve (labels, components): una imagen int32 con 0 fuera del área y
+    1..N en cada componente, y la lista de ComponentStats ordenada por etiqueta.
+    Las etiquetas siguen el orden de barrido del primer píxel de cada componente.
+    offset y board_size permiten etiquetar una ventana del tablero y expresar
+    las cajas y el contacto con el borde en coordenadas del tablero completo.
+    Con workers > 1 (por defecto LABEL_WORKERS) y un grid de al menos
+    LABEL_PARALLEL_MIN_PIXELS píxeles, el trabajo se reparte por franjas en
+    varios procesos (tile_labeling) con el mismo resultado.
+    """
+    if workers is None:
+        workers = LABEL_WORKERS
+    if workers > 1 and grid.size >= LABEL_PARALLEL_MIN_PIXELS:
+        from .tile_labeling import label_components_tiled
+        return label_components_tiled(grid, border_margin, offset, board_size, workers)
+    return run_steps(label_components_steps(grid, border_margin, offset, board_size))
+
+def label_components_steps(grid, border_margin=3, offset=(0, 0), board_size=None):
+    """label_components por pasos: recorre el grid en bandas de CUT_SLICE_ROWS filas"""
+    height, width = grid.shape
+    band = CUT_SLICE_ROWS
+
+    # Tramos por bandas; cada tramo está en una sola fila, así que basta concatenarlos
+    row_parts, start_parts, end_parts = [], [], []
+    for top in range(0, max(height, 1), band):
+        rows, starts, ends = find_runs(grid[top:top + band])
+        row_parts.append(rows + top)
+        start_parts.append(starts)
+        end_parts.append(ends)
+        yield
+    rows = np.concatenate(row_parts)
+    starts = np.concatenate(start_parts)
+    ends = np.concatenate(end_parts)
+    run_count = len(rows)
+    if run_count == 0:
+        return np.zeros((height, width), dtype=np.int32), []
+
+    parent = list(range(run_count))
+    yield from union_overlapping_runs_steps(parent, rows, starts, ends)
+
+    # Etiquetas compactas en orden de aparición de cada raíz
+    run_labels = np.empty(run_count, dtype=np.int32)
+    root_labels = {}
+    for first in range(0, run_count, _RUNS_PER_STEP):
+        for i in range(first, min(first + _RUNS_PER_STEP, run_count)):
+            root = _find(parent, i)
+            label = root_labels.get(root)
+            if label is None:
+                label = len(root_labels) + 1
+                root_labels[root] = label
+            run_labels[i] = label
+        yield
+    component_count = len(root_labels)
+
+    # Pintar los tramos con un array de diferencias acumulado, banda a banda
+    labels = np.empty((height, width), dtype=np.int32)
+    bounds = np.searchsorted(rows, np.arange(0, height + band, band)).tolist()
+    for k, top in enumerate(range(0, height, band)):
+        first, last = bounds[k], bounds[k + 1]
+        paint_runs(labels[top:top + band], rows[first:last] - top, starts[first:last],
+                   ends[first:last], run_labels[first:last])
+        yield
+
+    components = component_stats(rows, starts, ends, run_labels, component_count,
+                                 (height, width), border_margin, offset, board_size)
+    return labels, components
+
+def paint_runs(labels, rows, starts, ends, run_labels):
+    """Escribe en labels (int32 [y, x]) la etiqueta de cada tramo y 0 en el resto.
+
+    rows son relativas a la primera fila de labels. Usa un array de
+    diferencias acumulado: cada tramo suma su etiqueta al principio y la resta
+    al final, dentro de su propia fila.
+    """
+    height, width = labels.shape
+    delta = np.zeros(height * width + 1, dtype=np.int32)
+    np.add.at(delta, rows * width + starts, run_labels)
+    np.add.at(delta, rows * width + ends, -run_labels)
+    labels[:] = np.cumsum(delta[:-1], dtype=np.int32).reshape(height, width)
+
+def component_stats(rows, starts, ends, run_labels, component_count, shape,
+                    border_margin=3, offset=(0, 0), board_size=None):
+    """ComponentStats de cada etiqueta 1..component_count a partir de sus tramos"""
+    height, width = shape
+    offset_x, offset_y = offset
+    board_width, board_height = board_size or (width, height)
+
+    lengths = ends - starts
+    pixel_counts = np.bincount(run_labels, weights=lengths, minlength=component_count + 1)
+    min_x = np.full(component_count + 1, width, dtype=np.int64)
+    max_x = np.full(component_count + 1, -1, dtype=np.int64)
+    min_y = np.full(component_count + 1, height, dtype=np.int64)
+    max_y = np.full(component_count + 1, -1, dtype=np.int64)
+    np.minimum.at(min_x, run_labels, starts)
+    np.maximum.at(max_x, run_labels, ends - 1)
+    np.minimum.at(min_y, run_labels, rows)
+    np.maximum.at(max_y, run_labels, rows)
+
+    components = []
+    for label in range(1, component_count + 1):
+        bbox = (int(min_x[label]) + offset_x, int(min_y[label]) + offset_y,
+                int(max_x[label]) + offset_x, int(max_y[label]) + offset_y)
+        components.append(ComponentStats(
+            label,
+            int(pixel_counts[label]),
+            bbox,
+            bbox_touches_border(bbox, board_width, board_height, border_margin)
+        ))
+    return components
+
+def bbox_touches_border(bbox, board_width, board_height, border_margin):
+    """Una componente toca el borde si su caja llega al margen (la caja es exacta)"""
+    min_x, min_y, max_x, max_y = bbox
+    return (min_x <= border_margin or max_x >= board_width - border_margin - 1 or
+            min_y <= border_margin or max_y >= board_height - border_margin - 1)
+
+class RegionMap:
+    """Etiquetado persistente del área jugable que se actualiza localmente tras cada corte.
+    
+    Los cortes solo eliminan píxeles, así que tras un corte solo cambian las
+    regiones que cruzan el rectángulo sucio; el resto conserva etiqueta y
+    estadísticas sin volver a analizar el tablero.
+    """
+
+    def __init__(self, grid, border_margin=3, workers=None):
+        self.height, self.width = grid.shape
+        self.border_margin = border_margin
+        self.labels, components = label_components(grid, border_margin=border_margin,
+                                                   workers=workers)
+        self.regions = {component.label: component for component in components}
+        self.next_label = len(components) + 1
+
+    def copy(self):
+        """Copia independiente para simular cortes sin tocar el estado real"""
+        clone = RegionMap.__new__(RegionMap)
+        clone.height, clone.width = self.height, self.width
+        clone.border_margin = self.border_margin
+        clone.labels = self.labels.copy()
+        clone.regions = {label: ComponentStats(c.label, c.pixel_count, c.bbox, c.touches_border)
+                         for label, c in self.regions.items()}
+        clone.next_label = self.next_label
+        return clone
+
+    def components(self):
+        """Regiones actuales, sin listas de píxeles"""
+        return list(self.regions.values())
+
+    def _new_label(self):
+        label = self.next_label
+        self.next_label += 1
+        return label
+
+    def _stats(self, label, pixel_count, bbox):
+        return ComponentStats(label, pixel_count, bbox,
+                              bbox_touches_border(bbox, self.width, self.height, self.border_margin))
+
+    def remove(self, grid, rect, workers=0):
+        """Actualiza el etiquetado después de eliminar píxeles de grid.
+        
+        grid es el bitmap ya recortado y rect = (min_x, min_y, max_x, max_y) una
+        caja inclusiva que contiene todos los píxeles eliminados. Con workers > 1
+        las ventanas de al menos LABEL_PARALLEL_MIN_PIXELS se etiquetan por
+        franjas en varios procesos (sin pausas intermedias).
+        """
+        run_steps(self.remove_steps(grid, rect, workers))
+
+    def remove_steps(self, grid, rect, workers=0):
+        """remove por pasos: las pasadas sobre la ventana se hacen en bandas de filas"""
+        min_x, min_y, max_x, max_y = rect
+        band = CUT_SLICE_ROWS
+        # Ventana W = rect ampliado 1 píxel; el anillo W - rect no ha cambiado
+        wx0, wy0 = max(0, min_x - 1), max(0, min_y - 1)
+        wx1, wy1 = min(self.width - 1, max_x + 1), min(self.height - 1, max_y + 1)
+        window = (slice(wy0, wy1 + 1), slice(wx0, wx1 + 1))
+        inner_x = slice(min_x - wx0, max_x - wx0 + 1)
+        inner_y0, inner_y1 = min_y - wy0, max_y - wy0 + 1
+        window_height = wy1 - wy0 + 1
+
+        old_window = self.labels[window].copy()
+        affected = set()
+        for top in range(inner_y0, inner_y1, band):
+            affected.update(np.unique(old_window[top:min(top + band, inner_y1), inner_x]).tolist())
+            yield
+        affected.discard(0)
+
+        sub_labels, sub_components = yield from self._label_window_steps(
+            grid[window], (wx0, wy0), workers)
+
+        # Dueño de cada subcomponente: la etiqueta antigua de sus píxeles del anillo.
+        # Píxeles del anillo conectados dentro de W ya lo estaban antes, así que
+        # cada subcomponente tiene como mucho un dueño.
+        pair_parts = []
+        for top in range(0, window_height, band):
+            bottom = min(top + band, window_height)
+            sub_band = sub_labels[top:bottom]
+            ring = np.ones(sub_band.shape, dtype=np.bool_)
+            ring[max(top, inner_y0) - top:max(min(bottom, inner_y1) - top, 0), inner_x] = False
+            ring &= sub_band > 0
+            if ring.any():
+                pair_parts.append(np.stack((sub_band[ring], old_window[top:bottom][ring])))
+            yield
+        owners = {}
+        if pair_parts:
+            pairs = np.unique(np.concatenate(pair_parts, axis=1), axis=1)
+            owners = dict(zip(pairs[0].tolist(), pairs[1].tolist()))
+
+        contacts = {}
+        for sub_label, owner in owners.items():
+            contacts.setdefault(owner, []).append(sub_label)
+
+        lookup = np.zeros(len(sub_components) + 1, dtype=np.int32)
+        for sub in sub_components:
+            owner = owners.get(sub.label)
+            if owner is None:
+                # Encerrada por completo en el rectángulo: región nueva con estadísticas exactas
+                label = self._new_label()
+                lookup[sub.label] = label
+                self.regions[label] = self._stats(label, sub.pixel_count, sub.bbox)
+            else:
+                lookup[sub.label] = owner
+
+        # Escribir las etiquetas nuevas y contar, de paso, los píxeles de las
+        # regiones con un solo contacto antes y después del corte
+        single = [label for label in affected if len(contacts.get(label, ())) == 1]
+        removed_counts = dict.fromkeys(single, 0)
+        labels_window = self.labels[window]
+        for top in range(0, window_height, band):
+            bottom = min(top + band, window_height)
+            new_band = lookup[sub_labels[top:bottom]]
+            labels_window[top:bottom] = new_band
+            for label in single:
+                removed_counts[label] += (int(np.count_nonzero(old_window[top:bottom] == label)) -
+                                          int(np.count_nonzero(new_band == label)))
+            yield
+
+        for label in affected:
+            owned = contacts.get(label)
+            if not owned:
+                # Todos sus píxeles estaban dentro del rectángulo
+                del self.regions[label]
+            elif len(owned) == 1:
+                region = self.regions[label]
+                pixel_count = region.pixel_count - removed_counts[label]
+                bbox = yield from self._shrink_bbox_steps(label, region.bbox, (wx0, wy0, wx1, wy1))
+                self.regions[label] = self._stats(label, pixel_count, bbox)
+            else:
+                # Varios contactos: solo la conectividad fuera de W decide si se partió
+                yield from self._relabel_region_steps(label, workers)
+
+    def _shrink_bbox_steps(self, label, bbox, window_rect):
+        """Recalcula los lados de la caja que caen dentro de la ventana modificada"""
+        min_x, min_y, max_x, max_y = bbox
+        wx0, wy0, wx1, wy1 = window_rect
+        labels = self.labels
+        checked = 0
+
+        if wx0 <= min_x <= wx1:
+            while not (labels[min_y:max_y + 1, min_x] == label).any():
+                min_x += 1
+                checked += 1
+                if checked % CUT_SLICE_ROWS == 0:
+                    yield
+        if wx0 <= max_x <= wx1:
+            while not (labels[min_y:max_y + 1, max_x] == label).any():
+                max_x -= 1
+                checked += 1
+                if checked % CUT_SLICE_ROWS == 0:
+                    yield
+        if wy0 <= min_y <= wy1:
+            while not (labels[min_y, min_x:max_x + 1] == label).any():
+                min_y += 1
+                checked += 1
+                if checked % CUT_SLICE_ROWS == 0:
+                    yield
+        if wy0 <= max_y <= wy1:
+            while not (labels[max_y, min_x:max_x + 1] == label).any():
+                max_y -= 1
+                checked += 1
+                if checked % CUT_SLICE_ROWS == 0:
+                    yield
+
+        return min_x, min_y, max_x, max_y
+
+    def _label_window_steps(self, mask, offset, workers):
+        """Etiqueta una ventana del tablero: por franjas en varios procesos si es
+        grande y workers > 1, o por pasos (reanudable) en el resto de casos"""
+        board_size = (self.width, self.height)
+        if workers > 1 and mask.size >= LABEL_PARALLEL_MIN_PIXELS:
+            return label_components(mask, self.border_margin, offset, board_size, workers)
+        return (yield from label_components_steps(mask, self.border_margin, offset, board_size))
+
+    def _relabel_region_steps(self, label, workers=0):
+        """Vuelve a etiquetar una sola región dentro de su caja y reparte sus trozos"""
+        min_x, min_y, max_x, max_y = self.regions[label].bbox
+        window = (slice(min_y, max_y + 1), slice(min_x, max_x + 1))
+        labels_window = self.labels[window]
+
+        piece_labels, pieces = yield from self._label_window_steps(
+            labels_window == label, (min_x, min_y), workers)
+
+        # El trozo más grande conserva la etiqueta original
+        largest = max(pieces, key=lambda piece: piece.pixel_count)
+        lookup = np.zeros(len(pieces) + 1, dtype=np.int32)
+        for piece in pieces:
+            new_label = label if piece is largest else self._new_label()
+            lookup[piece.label] = new_label
+            self.regions[new_label] = self._stats(new_label, piece.pixel_count, piece.bbox)
+
+        for top in range(0, max_y - min_y + 1, CUT_SLICE_ROWS):
+            piece_band = piece_labels[top:top + CUT_SLICE_ROWS]
+            inside = piece_band > 0
+            labels_window[top:top + CUT_SLICE_ROWS][inside] = lookup[piece_band[inside]]
+            yield
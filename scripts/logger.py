@@ -0,0 +1,153 @@
+# logger.py - Registro por niveles con formato diferido y volcado en segundo plano
+
+import os
+import sys
+import time
+import atexit
+import threading
+from collections import deque
+from .config import *
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR', OFF: 'OFF'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+def _noop(*args, **kwargs):
+    """Sustituto de los métodos de nivel desactivados"""
+    return None
+
+class LogBuffer:
+    """Buffer circular compartido que un hilo de fondo vuelca al stream.
+
+    El hilo del juego solo añade tuplas al deque; el formateo de los mensajes
+    y la escritura en terminal ocurren en el hilo de volcado.
+    """
+    def __init__(self, capacity=LOG_BUFFER_SIZE, flush_interval=LOG_FLUSH_INTERVAL, stream=None):
+        self.records = deque(maxlen=capacity)
+        self.flush_interval = flush_interval
+        self.stream = stream
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def append(self, record):
+        self.records.append(record)
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="log-flush", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Formatea y escribe todos los registros pendientes"""
+        with self._lock:
+            if not self.records:
+                return
+            stream = self.stream or sys.stdout
+            lines = []
+            while self.records:
+                try:
+                    created, level, name, message, args = self.records.popleft()
+                except IndexError:
+                    break
+                lines.append(format_record(created, level, name, message, args))
+            try:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            except (OSError, ValueError):
+                pass  # Stream cerrado al salir: se descartan los registros
+
+def format_record(created, level, name, message, args):
+    """Aplica el formato diferido message % args"""
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError) as e:
+            message = f"{message} {args!r} (error de formato: {e})"
+    clock = time.strftime("%H:%M:%S", time.localtime(created))
+    return f"{clock}.{int(created * 1000) % 1000:03d} [{LEVEL_NAMES[level]}] {name}: {message}"
+
+class Logger:
+    """Logger con niveles; los métodos de niveles desactivados son funciones vacías.
+
+    Los mensajes usan formato diferido: log.debug("corte con %d puntos", n)
+    solo formatea si el nivel está activo, y lo hace en el hilo de volcado.
+    """
+    def __init__(self, name, buffer, level=WARNING):
+        self.name = name
+        self.buffer = buffer
+        self.set_level(level)
+
+    def set_level(self, level):
+        """Cambia el nivel y reasigna los métodos de cada nivel"""
+        if isinstance(level, str):
+            level = LEVELS[level.upper()]
+        self.level = level
+        self.debug_enabled = level <= DEBUG
+        for method_level, method_name in ((DEBUG, 'debug'), (INFO, 'info'),
+                                          (WARNING, 'warning'), (ERROR, 'error')):
+            if method_level >= level:
+                setattr(self, method_name, self._emitter(method_level))
+            else:
+                setattr(self, method_name, _noop)
+
+    def _emitter(self, level):
+        append = self.buffer.append
+        name = self.name
+
+        def emit(message, *args):
+            append((time.time(), level, name, message, args))
+        return emit
+
+    def is_enabled(self, level):
+        return level >= self.level
+
+# Nivel inicial: LOG_LEVEL de config, o la variable de entorno GALS_LOG_LEVEL
+# (un valor desconocido se ignora con un aviso)
+_env_level = os.environ.get('GALS_LOG_LEVEL', '').strip()
+_invalid_env_level = bool(_env_level) and _env_level.upper() not in LEVELS
+if not _env_level or _invalid_env_level:
+    DEFAULT_LEVEL = LOG_LEVEL
+else:
+    DEFAULT_LEVEL = _env_level.upper()
+
+_buffer = LogBuffer()
+_loggers = {}
+_level = DEFAULT_LEVEL
+
+def get_logger(name):
+    """Devuelve el logger de un módulo, compartiendo buffer y nivel global"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name, _buffer, _level)
+    return logger
+
+def set_level(level):
+    """Cambia el nivel de todos los loggers"""
+    global _level
+    _level = level
+    for logger in _loggers.values():
+        logger.set_level(level)
+
+def get_level():
+    return _level
+
+def flush():
+    """Vuelca de inmediato los registros pendientes"""
+    _buffer.flush()
+
+if _invalid_env_level:
+    get_logger(__name__).warning("GALS_LOG_LEVEL desconocido (%r): se usa %s", _env_level, LOG_LEVEL)
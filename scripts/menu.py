@@ -4,12 +4,13 @@ import pygame
 import sys
 import random
 from .config import *
+from .text_cache import get_font, render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, font_size=MENU_FONT_SIZE):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
         self.is_hovered = False
         self.is_clicked = False
         
@@ -44,15 +45,16 @@ class Button:
         pygame.draw.rect(screen, WHITE, self.rect, 2)
         
         # Dibujar texto centrado
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = render_text(self.font, self.text, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
 class MainMenu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, MENU_TITLE_SIZE)
-        self.font_menu = pygame.font.Font(None, MENU_FONT_SIZE)
+        self.font_title = get_font(MENU_TITLE_SIZE)
+        self.font_menu = get_font(MENU_FONT_SIZE)
+        self.font_info = get_font(24)
         
         # Calcular posiciones centradas
         center_x = WINDOW_WIDTH // 2
@@ -125,12 +127,12 @@ class MainMenu:
                              particle['size'])
         
         # Título del juego
-        title_text = self.font_title.render("GALS PANIC", True, YELLOW)
+        title_text = render_text(self.font_title, "GALS PANIC", YELLOW)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
         # Subtítulo
-        subtitle_text = self.font_menu.render("Remake", True, WHITE)
+        subtitle_text = render_text(self.font_menu, "Remake", WHITE)
         subtitle_rect = subtitle_text.get_rect(center=(WINDOW_WIDTH // 2, 200))
         self.screen.blit(subtitle_text, subtitle_rect)
         
@@ -139,9 +141,10 @@ class MainMenu:
             button.draw(self.screen)
         
         # Instrucciones en la parte inferior
-        info_text = pygame.font.Font(None, 24).render(
+        info_text = render_text(
+            self.font_info,
             "Usa las flechas para moverte - Corta áreas para revelar la imagen", 
-            True, GRAY
+            GRAY
         )
         info_rect = info_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
         self.screen.blit(info_text, info_rect)
@@ -149,8 +152,8 @@ class MainMenu:
 class OptionsMenu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, MENU_TITLE_SIZE)
-        self.font_menu = pygame.font.Font(None, MENU_FONT_SIZE)
+        self.font_title = get_font(MENU_TITLE_SIZE)
+        self.font_menu = get_font(MENU_FONT_SIZE)
         
         center_x = WINDOW_WIDTH // 2
         start_y = WINDOW_HEIGHT // 2 - 100
@@ -161,14 +164,14 @@ class OptionsMenu:
                 start_y,
                 MENU_BUTTON_WIDTH,
                 MENU_BUTTON_HEIGHT,
-                "Volumen: 100%"
+                f"Volumen: {DEFAULT_SETTINGS['volume']}%"
             ),
             'difficulty': Button(
                 center_x - MENU_BUTTON_WIDTH // 2,
                 start_y + MENU_BUTTON_HEIGHT + MENU_SPACING,
                 MENU_BUTTON_WIDTH,
                 MENU_BUTTON_HEIGHT,
-                "Dificultad: Normal"
+                f"Dificultad: {DEFAULT_SETTINGS['difficulty']}"
             ),
             'back': Button(
                 center_x - MENU_BUTTON_WIDTH // 2,
@@ -179,8 +182,8 @@ class OptionsMenu:
             )
         }
         
-        self.volume = 100
-        self.difficulty = "Normal"
+        self.volume = DEFAULT_SETTINGS['volume']
+        self.difficulty = DEFAULT_SETTINGS['difficulty']
     
     def handle_events(self, event):
         result = None
@@ -206,7 +209,7 @@ class OptionsMenu:
         self.screen.fill(BLACK)
         
         # Título
-        title_text = self.font_title.render("OPCIONES", True, YELLOW)
+        title_text = render_text(self.font_title, "OPCIONES", YELLOW)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
@@ -219,7 +222,13 @@ class MenuManager:
         self.screen = screen
         self.current_menu = 'main'
         self.main_menu = MainMenu(screen)
-        self.options_menu = OptionsMenu(screen)
+        self._options_menu = None  # Se construye al abrir el menú de opciones
+    
+    @property
+    def options_menu(self):
+        if self._options_menu is None:
+            self._options_menu = OptionsMenu(self.screen)
+        return self._options_menu
     
     def handle_events(self, event):
         if self.current_menu == 'main':
@@ -247,6 +256,8 @@ class MenuManager:
             self.options_menu.draw()
     
     def get_settings(self):
+        if self._options_menu is None:
+            return dict(DEFAULT_SETTINGS)
         return {
             'volume': self.options_menu.volume,
             'difficulty': self.options_menu.difficulty
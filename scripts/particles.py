@@ -0,0 +1,112 @@
+# particles.py - Sistema de partículas con almacenamiento en arrays
+
+import random
+import numpy as np
+import pygame
+from .config import *
+
+class ParticleSystem:
+    """Partículas en arrays de capacidad fija (una columna por atributo).
+
+    Las partículas vivas ocupan las posiciones [0, count). Las que mueren se
+    reemplazan con las vivas del final (swap-remove), así los arrays no se
+    redimensionan ni se recorren elemento a elemento en Python.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, gravity=PARTICLE_GRAVITY):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)  # Índice en palette
+        self.palette = []
+        self.sprites = {}  # (índice de color, radio) -> superficie pre-renderizada
+        # Semilla tomada de random: random.seed() también fija las partículas
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def _color_index(self, color):
+        color = tuple(color)
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def emit(self, amount, x, y, speed, life, color, spread=0):
+        """Crea amount partículas en (x, y) ± spread con velocidad uniforme en ±speed.
+
+        Si no queda capacidad, las partículas sobrantes se descartan.
+        """
+        start = self.count
+        amount = min(amount, self.capacity - start)
+        if amount <= 0:
+            return
+        end = start + amount
+        rng = self.rng
+        if spread:
+            self.x[start:end] = x + rng.integers(-spread, spread + 1, amount)
+            self.y[start:end] = y + rng.integers(-spread, spread + 1, amount)
+        else:
+            self.x[start:end] = x
+            self.y[start:end] = y
+        self.vx[start:end] = rng.uniform(-speed, speed, amount)
+        self.vy[start:end] = rng.uniform(-speed, speed, amount)
+        self.life[start:end] = life
+        self.color[start:end] = self._color_index(color)
+        self.count = end
+
+    def update(self):
+        """Integra un tick (velocidad, gravedad y vida) y recicla las muertas"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += self.gravity
+        self.life[:n] -= 1
+
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if len(dead) == 0:
+            return
+        alive_count = n - len(dead)
+        # Huecos dentro de [0, alive_count) que se rellenan con las vivas de la cola
+        holes = dead[dead < alive_count]
+        if len(holes):
+            tail = np.arange(alive_count, n)
+            tail = tail[self.life[alive_count:n] > 0]
+            for column in (self.x, self.y, self.vx, self.vy, self.life, self.color):
+                column[holes] = column[tail]
+        self.count = alive_count
+
+    def _sprite(self, color_index, radius):
+        """Círculo pre-renderizado; equivale a pygame.draw.circle con ese radio"""
+        sprite = self.sprites.get((color_index, radius))
+        if sprite is None:
+            color = self.palette[color_index]
+            key = BLACK if color != BLACK else (255, 0, 255)
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+            sprite.fill(key)
+            sprite.set_colorkey(key)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self.sprites[(color_index, radius)] = sprite
+        return sprite
+
+    def draw(self, screen):
+        """Dibuja todas las partículas con un único blits(); el radio depende de la vida"""
+        n = self.count
+        if n == 0:
+            return
+        radius = np.maximum(1, self.life[:n] // 10)
+        left = (self.x[:n].astype(np.int32) - radius).tolist()
+        top = (self.y[:n].astype(np.int32) - radius).tolist()
+        sprite = self._sprite
+        screen.blits([(sprite(color, r), (px, py))
+                      for color, r, px, py in zip(self.color[:n].tolist(), radius.tolist(), left, top)],
+                     doreturn=False)
@@ -0,0 +1,61 @@
+# profiler.py - Instrumentación de tiempos por fase del frame
+
+import time
+from collections import deque
+from .config import *
+
+class FrameProfiler:
+    """Registra el tiempo de pared de cada fase en ventanas deslizantes.
+
+    Uso: started = profiler.start(); ...; profiler.stop('fase', started).
+    Desactivado, start() y stop() solo comprueban un booleano.
+    """
+    def __init__(self, enabled=False, window=PROFILER_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}  # fase -> deque con los últimos tiempos en ms
+        self._stats = {}
+        self._stats_version = -1
+        self._version = 0
+
+    def start(self):
+        """Marca de tiempo inicial (0.0 si la instrumentación está desactivada)"""
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def stop(self, phase, started):
+        """Registra el tiempo transcurrido desde started en la fase indicada"""
+        if not self.enabled:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(elapsed_ms)
+        self._version += 1
+
+    def reset(self):
+        """Descarta todas las muestras"""
+        self.samples.clear()
+        self._stats = {}
+        self._version += 1
+
+    def stats(self):
+        """Devuelve {fase: (p50, p95, p99, max)} en ms sobre la ventana actual"""
+        if self._stats_version != self._version:
+            self._stats = {phase: percentiles(samples)
+                           for phase, samples in self.samples.items() if samples}
+            self._stats_version = self._version
+        return self._stats
+
+    def report_rows(self):
+        """Filas (fase, p50, p95, p99, max) para el overlay de debug, ordenadas por fase"""
+        return [(phase,) + values for phase, values in sorted(self.stats().items())]
+
+def percentiles(samples):
+    """p50, p95, p99 y máximo (método del rango más cercano)"""
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return (ordered[round(last * 0.50)], ordered[round(last * 0.95)],
+            ordered[round(last * 0.99)], ordered[last])
@@ -0,0 +1,221 @@
+# replay.py - Grabación y reproducción determinista de partidas
+
+import sys
+import gzip
+import json
+import time
+import zlib
+import struct
+import random
+import argparse
+import cProfile
+
+import pygame
+from .config import *
+from .game import Game
+from .headless import KeyState, init_headless
+from .profiler import percentiles
+
+REPLAY_VERSION = 2
+
+# Teclas de movimiento: un bit por tecla en cada tick
+MOVEMENT_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+# Teclas de evento que cambian el estado del juego (pausa, reinicio, nivel, debug)
+EVENT_KEYS = (pygame.K_p, pygame.K_r, pygame.K_SPACE, pygame.K_F1)
+# Código de evento que marca el tick en el que se aplicó un corte calculado en segundo plano
+CUT_COMMIT_EVENT = 255
+
+_tick_header = struct.Struct('<BB')
+_tick_hash = struct.Struct('<I')
+
+def encode_keys(keys):
+    """Máscara de bits de las flechas pulsadas"""
+    mask = 0
+    for bit, key in enumerate(MOVEMENT_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+def decode_keys(mask):
+    return KeyState(key for bit, key in enumerate(MOVEMENT_KEYS) if mask & (1 << bit))
+
+def state_hash(game):
+    """CRC32 del estado relevante tras un tick (jugador, marcador y enemigos)"""
+    values = [game.ticks, game.state.value, game.score, game.lives, game.level,
+              game.player.x, game.player.y, len(game.player.trail)]
+    for enemy in game.enemies:
+        values.append(enemy.x)
+        values.append(enemy.y)
+    return zlib.crc32(struct.pack(f'<{len(values)}d', *values))
+
+class RecordingInput:
+    """Envuelve una fuente de entrada y anota la máscara leída en cada tick"""
+    def __init__(self, source):
+        self.source = source
+        self.mask = 0
+
+    def get_pressed(self):
+        keys = self.source.get_pressed()
+        self.mask = encode_keys(keys)
+        return keys
+
+class ReplayRecorder:
+    """Graba una partida en un flujo gzip: cabecera JSON y un registro por tick.
+
+    Cada registro ocupa 2 bytes de cabecera (máscara de flechas y número de
+    eventos), un byte por evento y 4 bytes de hash del estado. Los cortes se
+    aplican cuando termina el worker, así que el tick de cada corte aplicado
+    se graba como un evento más (CUT_COMMIT_EVENT). Al crearse, siembra
+    random con la semilla grabada: debe hacerse antes de crear Game.
+    """
+    def __init__(self, path, settings, seed=None):
+        self.path = path
+        self.seed = random.getrandbits(32) if seed is None else seed
+        random.seed(self.seed)
+        self.ticks = 0
+        self.events = []
+        self.input = None
+        self.cuts_committed = 0
+        self.file = gzip.open(path, 'wb')
+        header = {'version': REPLAY_VERSION, 'seed': self.seed, 'settings': settings,
+                  'tick_rate': TICK_RATE, 'cell_size': AREA_CELL_SIZE}
+        self.file.write(json.dumps(header).encode('utf-8') + b'\n')
+
+    def wrap(self, source):
+        """Fuente de entrada para Game que registra lo que lee"""
+        self.input = RecordingInput(source)
+        return self.input
+
+    def record_event(self, key):
+        """Anota una tecla de evento entregada a Game.handle_events antes del próximo tick"""
+        if key in EVENT_KEYS:
+            self.events.append(EVENT_KEYS.index(key))
+
+    def end_tick(self, game):
+        """Escribe el registro del tick que acaba de ejecutarse"""
+        mask = 0
+        if self.input is not None:
+            mask = self.input.mask
+            self.input.mask = 0
+        if game.cuts_committed != self.cuts_committed:
+            self.cuts_committed = game.cuts_committed
+            self.events.append(CUT_COMMIT_EVENT)
+        self.file.write(_tick_header.pack(mask, len(self.events)) + bytes(self.events) +
+                        _tick_hash.pack(state_hash(game)))
+        self.events.clear()
+        self.ticks += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+def read_replay(path):
+    """Devuelve (cabecera, iterador de (máscara, eventos, hash)) leyendo en streaming"""
+    f = gzip.open(path, 'rb')
+    header = json.loads(f.readline())
+    if header.get('version') != REPLAY_VERSION:
+        f.close()
+        raise ValueError(f"Versión de replay no soportada: {header.get('version')}")
+
+    def records():
+        with f:
+            while True:
+                head = f.read(_tick_header.size)
+                if len(head) < _tick_header.size:
+                    return
+                mask, count = _tick_header.unpack(head)
+                events = f.read(count)
+                (expected,) = _tick_hash.unpack(f.read(_tick_hash.size))
+                yield mask, events, expected
+    return header, records()
+
+class ReplayInput:
+    """Entrada que devuelve la máscara grabada del tick actual"""
+    def __init__(self):
+        self.keys = KeyState()
+
+    def get_pressed(self):
+        return self.keys
+
+def play_replay(path, verify=True, stop_on_divergence=True):
+    """Reproduce una grabación sin ventana; devuelve un resumen con tiempos por tick.
+
+    Los cortes se calculan en el mismo tick ('sync') y se aplican solo en los
+    ticks marcados en la grabación. Con verify=True compara el hash de cada tick con el grabado e informa del
+    primer tick en el que la simulación diverge.
+    """
+    header, records = read_replay(path)
+    init_headless()
+    random.seed(header['seed'])
+    replay_input = ReplayInput()
+    game = Game(None, header['settings'], input_source=replay_input, cut_mode='sync',
+                cell_size=header.get('cell_size', 1))
+    commit_cut = [False]
+    game.cut_commit_gate = lambda: commit_cut[0]
+
+    tick_times = []
+    divergences = []
+    ticks = 0
+    start = time.perf_counter()
+    for mask, events, expected in records:
+        tick_started = time.perf_counter()
+        commit_cut[0] = CUT_COMMIT_EVENT in events
+        for code in events:
+            if code == CUT_COMMIT_EVENT:
+                continue
+            game.handle_events(pygame.event.Event(pygame.KEYDOWN, key=EVENT_KEYS[code],
+                                                  mod=0, unicode=''))
+        replay_input.keys = decode_keys(mask)
+        game.update()
+        tick_times.append((time.perf_counter() - tick_started) * 1000)
+        ticks += 1
+        if verify and state_hash(game) != expected:
+            divergences.append(ticks)
+            if stop_on_divergence:
+                break
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99, worst = percentiles(tick_times) if tick_times else (0.0, 0.0, 0.0, 0.0)
+    return {
+        'ticks': ticks,
+        'elapsed_s': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed > 0 else float('inf'),
+        'tick_ms': {'p50': p50, 'p95': p95, 'p99': p99, 'max': worst},
+        'first_divergence': divergences[0] if divergences else None,
+        'divergences': len(divergences),
+        'score': game.score,
+        'level': game.level,
+    }
+
+def main(argv=None):
+    """Punto de entrada: python -m scripts.replay partida.replay"""
+    parser = argparse.ArgumentParser(description="Reproduce una partida grabada sin ventana")
+    parser.add_argument('path', help="Archivo grabado con main.py --record")
+    parser.add_argument('--no-verify', action='store_true', help="No comparar hashes de estado")
+    parser.add_argument('--keep-going', action='store_true', help="Seguir tras una divergencia")
+    parser.add_argument('--cprofile', metavar='OUT', help="Guardar un perfil cProfile de la reproducción")
+    parser.add_argument('--output', help="Guardar el resumen en un archivo JSON")
+    args = parser.parse_args(argv)
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    result = play_replay(args.path, verify=not args.no_verify,
+                         stop_on_divergence=not args.keep_going)
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+
+    timing = result['tick_ms']
+    print(f"{result['ticks']} ticks en {result['elapsed_s']:.2f}s "
+          f"(p50 {timing['p50']:.3f} ms, p95 {timing['p95']:.3f} ms, "
+          f"p99 {timing['p99']:.3f} ms, max {timing['max']:.3f} ms)")
+    if result['first_divergence'] is not None:
+        print(f"DIVERGENCIA en el tick {result['first_divergence']}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 1 if result['first_divergence'] is not None else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# screenshots.py - Capturas de pantalla codificadas y guardadas en segundo plano
+
+import os
+import zlib
+import queue
+import struct
+import datetime
+import threading
+
+import numpy as np
+import pygame
+from .config import *
+from . import logger
+
+log = logger.get_logger(__name__)
+
+# pygame.image.tobytes existe desde pygame 2.1.3; antes se llamaba tostring
+_surface_bytes = getattr(pygame.image, 'tobytes', pygame.image.tostring)
+
+def encode_png(width, height, rgb):
+    """Codifica píxeles RGB (bytes, fila a fila) como PNG de 8 bits sin filtro.
+
+    zlib.compress y zlib.crc32 liberan el GIL, así que la codificación en un
+    hilo de fondo no frena el bucle del juego (pygame.image.save sí lo haría).
+    """
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 0  # Tipo de filtro por fila: ninguno
+    rows[:, 1:] = np.frombuffer(rgb, dtype=np.uint8).reshape(height, width * 3)
+
+    def chunk(tag, payload):
+        crc = zlib.crc32(payload, zlib.crc32(tag)) & 0xFFFFFFFF
+        return struct.pack('>I', len(payload)) + tag + payload + struct.pack('>I', crc)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(rows.tobytes(), SCREENSHOT_COMPRESSION)) +
+            chunk(b'IEND', b''))
+
+class ScreenshotWriter:
+    """Copia el frame en el hilo principal y lo guarda con un pool de hilos.
+
+    La cola está acotada: si los hilos no dan abasto, las capturas nuevas se
+    descartan en lugar de bloquear el juego. El modo ráfaga guarda un frame
+    cada burst_every ticks de simulación hasta que se desactiva: el intervalo
+    entre capturas no depende de la velocidad del render.
+    """
+    def __init__(self, directory=SCREENSHOTS_PATH, workers=SCREENSHOT_WORKERS,
+                 queue_size=SCREENSHOT_QUEUE_SIZE):
+        self.directory = directory
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.saved = 0
+        self.dropped = 0
+        self.burst_every = 0  # 0 = ráfaga desactivada
+        self._burst_tick = 0
+        self._burst_due = False
+        self._burst_index = 0
+        self._burst_name = None
+        self._workers = [threading.Thread(target=self._run, name=f"screenshot-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def capture(self, surface, name=None):
+        """Encola una copia del frame; devuelve la ruta del archivo o None si se descarta"""
+        if name is None:
+            name = f"gals_panic_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = os.path.join(self.directory, f"{name}.png")
+        width, height = surface.get_size()
+        item = (path, width, height, _surface_bytes(surface, 'RGB'))
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            log.warning("Cola de capturas llena: se descarta %s", path)
+            return None
+        return path
+
+    @property
+    def burst_active(self):
+        return self.burst_every > 0
+
+    def start_burst(self, every=SCREENSHOT_BURST_EVERY):
+        """Empieza a guardar un frame cada every ticks"""
+        self.burst_every = every
+        self._burst_tick = 0
+        self._burst_due = False
+        self._burst_index = 0
+        self._burst_name = f"gals_panic_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    def stop_burst(self):
+        self.burst_every = 0
+        self._burst_due = False
+
+    def on_tick(self):
+        """Llamar una vez por tick de simulación; marca la captura si toca en modo ráfaga"""
+        if not self.burst_every:
+            return
+        if self._burst_tick % self.burst_every == 0:
+            self._burst_due = True
+        self._burst_tick += 1
+
+    def on_frame(self, surface):
+        """Llamar una vez por frame presentado; guarda la captura marcada por on_tick"""
+        if not self._burst_due:
+            return
+        self._burst_due = False
+        self.capture(surface, f"{self._burst_name}_{self._burst_index:05d}")
+        self._burst_index += 1
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                path, width, height, rgb = item
+                data = encode_png(width, height, rgb)
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.saved += 1
+                log.info("Captura guardada: %s", path)
+            except Exception as e:
+                log.error("Error al guardar captura %s: %s", item[0], e)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Espera a que se escriban todas las capturas pendientes"""
+        self.queue.join()
+
+    def close(self):
+        """Escribe lo pendiente y detiene los hilos"""
+        self.stop_burst()
+        self.flush()
+        for _ in self._workers:
+            self.queue.put(None)
+        for worker in self._workers:
+            worker.join()
@@ -0,0 +1,248 @@
+# spatial.py - Índices espaciales para consultas rápidas de colisión y ocupación
+
+import heapq
+import numpy as np
+
+class CellMapping:
+    """Conversión entre píxeles y celdas cuadradas de size píxeles de lado.
+
+    Es el único sitio donde se divide o multiplica por el tamaño de celda:
+    posiciones, arrays de posiciones, rectángulos, longitudes y máscaras.
+    """
+    __slots__ = ('size',)
+
+    def __init__(self, size=1):
+        self.size = size
+
+    @property
+    def area(self):
+        """Píxeles por celda"""
+        return self.size * self.size
+
+    def to_cell(self, x, y):
+        """Celda que contiene el punto (x, y) en píxeles"""
+        return int(x) // self.size, int(y) // self.size
+
+    def to_cells(self, xs, ys):
+        """to_cell para arrays enteros de coordenadas"""
+        return xs // self.size, ys // self.size
+
+    def to_cell_rect(self, x0, y0, x1, y1):
+        """Celdas que tocan el rectángulo inclusivo (x0, y0, x1, y1) en píxeles"""
+        return self.to_cell(x0, y0) + self.to_cell(x1, y1)
+
+    def to_pixel(self, cell_x, cell_y, centered=False):
+        """Esquina superior izquierda de la celda (o su centro) en píxeles"""
+        offset = self.size // 2 if centered else 0
+        return cell_x * self.size + offset, cell_y * self.size + offset
+
+    def cells_for(self, length):
+        """Celdas necesarias para cubrir length píxeles (redondeo hacia arriba)"""
+        return -(-length // self.size)
+
+    def expand(self, mask):
+        """Máscara [y, x] de celdas convertida a píxeles"""
+        if self.size == 1:
+            return mask
+        return mask.repeat(self.size, axis=0).repeat(self.size, axis=1)
+
+class SegmentGrid:
+    """Índice de segmentos en una rejilla uniforme (cubetas por celda)"""
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {}  # (celda_x, celda_y) -> lista de índices de segmento
+        self.segments = []  # (x0, y0, x1, y1) por índice
+
+    def __len__(self):
+        return len(self.segments)
+
+    def clear(self):
+        """Elimina todos los segmentos"""
+        self.cells.clear()
+        self.segments.clear()
+
+    def _cell_range(self, min_x, min_y, max_x, max_y):
+        """Celdas que cubren la caja dada"""
+        size = self.cell_size
+        for cell_y in range(int(min_y // size), int(max_y // size) + 1):
+            for cell_x in range(int(min_x // size), int(max_x // size) + 1):
+                yield cell_x, cell_y
+
+    def add_segment(self, x0, y0, x1, y1):
+        """Añade un segmento en todas las celdas que toca su caja"""
+        index = len(self.segments)
+        self.segments.append((x0, y0, x1, y1))
+        for cell in self._cell_range(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)):
+            self.cells.setdefault(cell, []).append(index)
+        return index
+
+    def query_circle(self, center_x, center_y, radius):
+        """Verifica si algún segmento pasa a menos de radius del centro"""
+        radius_sq = radius * radius
+        checked = set()
+        for cell in self._cell_range(center_x - radius, center_y - radius,
+                                     center_x + radius, center_y + radius):
+            for index in self.cells.get(cell, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if segment_distance_sq(center_x, center_y, *self.segments[index]) < radius_sq:
+                    return True
+        return False
+
+def segment_distance_sq(px, py, x0, y0, x1, y1):
+    """Distancia al cuadrado de un punto a un segmento"""
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        t = 0.0
+    else:
+        t = max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / length_sq))
+    nearest_x = x0 + t * dx
+    nearest_y = y0 + t * dy
+    return (px - nearest_x) ** 2 + (py - nearest_y) ** 2
+
+class OccupancyPyramid:
+    """Pirámide de conteos sobre un grid booleano [y, x] (True = ocupado).
+
+    levels[0] es el propio grid (compartido, no se copia) y cada levels[k]
+    cuenta las posiciones True de los bloques de 2^k x 2^k. Tras modificar
+    el grid hay que llamar a update() con el rectángulo cambiado. Las
+    consultas bajan por la pirámide saltando los bloques vacíos o completos,
+    así que su coste depende del borde del rectángulo y no de su área.
+    Rectángulos (x0, y0, x1, y1) inclusivos, en posiciones del grid.
+    """
+    def __init__(self, grid):
+        self.height, self.width = grid.shape
+        self.levels = [grid]
+        level = grid.astype(np.int32)
+        while level.shape[0] > 1 or level.shape[1] > 1:
+            level = self._reduce(level)
+            self.levels.append(level)
+
+    @staticmethod
+    def _reduce(level):
+        """Suma de cada bloque de 2x2 (rellenando con ceros si la dimensión es impar)"""
+        height, width = level.shape
+        padded = np.zeros((height + height % 2, width + width % 2), dtype=np.int32)
+        padded[:height, :width] = level
+        return padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).sum(axis=(1, 3))
+
+    def update(self, rect):
+        """Recalcula los conteos de los bloques que cubren rect tras cambiar el grid"""
+        x0, y0, x1, y1 = rect
+        for k in range(1, len(self.levels)):
+            x0, y0, x1, y1 = x0 >> 1, y0 >> 1, x1 >> 1, y1 >> 1
+            child = self.levels[k - 1][2 * y0:2 * y1 + 2, 2 * x0:2 * x1 + 2]
+            self.levels[k][y0:y1 + 1, x0:x1 + 1] = self._reduce(child)
+
+    def total(self):
+        return int(self.levels[-1][0, 0])
+
+    def _clip(self, rect):
+        x0, y0, x1, y1 = rect
+        return max(0, x0), max(0, y0), min(self.width - 1, x1), min(self.height - 1, y1)
+
+    def count(self, rect):
+        """Número de posiciones True dentro de rect"""
+        x0, y0, x1, y1 = self._clip(rect)
+        if x0 > x1 or y0 > y1:
+            return 0
+        total = 0
+        stack = [(len(self.levels) - 1, 0, 0)]
+        while stack:
+            k, bx, by = stack.pop()
+            value = int(self.levels[k][by, bx])
+            if value == 0:
+                continue
+            size = 1 << k
+            left, top = bx * size, by * size
+            if x0 <= left and left + size - 1 <= x1 and y0 <= top and top + size - 1 <= y1:
+                total += value
+                continue
+            if value == size * size and k:
+                # Bloque completo: basta la intersección
+                total += ((min(x1, left + size - 1) - max(x0, left) + 1) *
+                          (min(y1, top + size - 1) - max(y0, top) + 1))
+                continue
+            stack.extend(self._children(k, bx, by, x0, y0, x1, y1))
+        return total
+
+    def any(self, rect):
+        """Verifica si hay alguna posición True dentro de rect"""
+        x0, y0, x1, y1 = self._clip(rect)
+        if x0 > x1 or y0 > y1:
+            return False
+        stack = [(len(self.levels) - 1, 0, 0)]
+        while stack:
+            k, bx, by = stack.pop()
+            if not self.levels[k][by, bx]:
+                continue
+            size = 1 << k
+            left, top = bx * size, by * size
+            if x0 <= left and left + size - 1 <= x1 and y0 <= top and top + size - 1 <= y1:
+                return True
+            stack.extend(self._children(k, bx, by, x0, y0, x1, y1))
+        return False
+
+    def first(self, rect):
+        """Primera posición True de rect en orden de barrido (fila a fila), o None.
+
+        Equivale a recorrer rect con dos bucles (y, x): la esquina superior
+        izquierda de cada bloque (recortado a rect) es una cota inferior en ese
+        orden de todas sus posiciones.
+        """
+        return self._search(rect, lambda left, top, right, bottom: (top, left))
+
+    def nearest(self, x, y, rect=None):
+        """Posición True más cercana a (x, y) (distancia euclídea), o None.
+
+        La distancia mínima de (x, y) a cada bloque acota la de sus
+        posiciones; los empates se resuelven por fila y columna. Con rect solo
+        se consideran las posiciones de ese rectángulo.
+        """
+        def distance(left, top, right, bottom):
+            dx = max(left - x, 0, x - right)
+            dy = max(top - y, 0, y - bottom)
+            return dx * dx + dy * dy, top, left
+        return self._search(rect or (0, 0, self.width - 1, self.height - 1), distance)
+
+    def _search(self, rect, key):
+        """Búsqueda por prioridad sobre los bloques no vacíos de rect.
+
+        key(left, top, right, bottom) del bloque recortado a rect debe ser una
+        cota inferior de la de cualquiera de sus posiciones; devuelve la
+        posición (x, y) de menor clave.
+        """
+        x0, y0, x1, y1 = self._clip(rect)
+        if x0 > x1 or y0 > y1 or not self.levels[-1][0, 0]:
+            return None
+        heap = [(0, len(self.levels) - 1, 0, 0)]
+        while heap:
+            _, k, by, bx = heapq.heappop(heap)
+            if k == 0:
+                return bx, by
+            for level, cx, cy in self._children(k, bx, by, x0, y0, x1, y1):
+                if not self.levels[level][cy, cx]:
+                    continue
+                size = 1 << level
+                priority = key(max(cx * size, x0), max(cy * size, y0),
+                               min(cx * size + size - 1, x1), min(cy * size + size - 1, y1))
+                heapq.heappush(heap, (priority, level, cy, cx))
+        return None
+
+    def _children(self, k, bx, by, x0, y0, x1, y1):
+        """Hijos (nivel, x, y) del bloque que se solapan con el rectángulo, en orden de barrido"""
+        level = k - 1
+        size = 1 << level
+        height, width = self.levels[level].shape
+        children = []
+        for cy in (2 * by, 2 * by + 1):
+            if cy >= height or cy * size > y1 or cy * size + size - 1 < y0:
+                continue
+            for cx in (2 * bx, 2 * bx + 1):
+                if cx >= width or cx * size > x1 or cx * size + size - 1 < x0:
+                    continue
+                children.append((level, cx, cy))
+        return children
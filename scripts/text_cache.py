@@ -0,0 +1,48 @@
+# text_cache.py - Fuentes cargadas una sola vez y caché LRU de textos renderizados
+
+import pygame
+from collections import OrderedDict
+from .config import *
+
+_fonts = {}
+
+def get_font(size, name=None):
+    """Devuelve la fuente (name, size), cargándola solo la primera vez"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+class TextCache:
+    """Superficies de texto indexadas por (fuente, texto, color) con desalojo LRU"""
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        """Superficie del texto; solo se rasteriza si no está en la caché"""
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+_cache = TextCache()
+
+def render_text(font, text, color):
+    """Renderiza text con la caché compartida (antialias activado)"""
+    return _cache.render(font, text, color)
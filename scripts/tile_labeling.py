@@ -0,0 +1,161 @@
+# tile_labeling.py - Etiquetado por franjas horizontales en varios procesos
+
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from .config import *
+from .labeling import find_runs, _find, union_overlapping_runs, paint_runs, component_stats
+
+_executor = None
+_executor_workers = 0
+
+def _get_executor(workers):
+    """Pool de procesos persistente ('spawn'), creado en el primer uso"""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        shutdown()
+        _executor = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        _executor_workers = workers
+    return _executor
+
+def shutdown():
+    """Detiene el pool de procesos si existe"""
+    global _executor
+    if _executor is not None:
+        # label_components_tiled espera a todas sus tareas: no queda nada pendiente
+        _executor.shutdown(wait=True)
+        _executor = None
+
+def _label_tile(name, shape, top, bottom):
+    """Tramos de las filas [top, bottom) del grid compartido y la raíz local de cada uno.
+
+    Las raíces son índices dentro de la franja; el proceso principal las
+    desplaza al concatenar las franjas.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        grid = np.ndarray(shape, dtype=np.bool_, buffer=shm.buf)
+        rows, starts, ends = find_runs(grid[top:bottom])
+        del grid  # Soltar la vista antes de cerrar el bloque
+        parent = list(range(len(rows)))
+        union_overlapping_runs(parent, rows, starts, ends)
+        roots = np.array([_find(parent, i) for i in range(len(rows))], dtype=np.int64)
+        return rows + top, starts, ends, roots
+    finally:
+        shm.close()
+
+def _paint_tile(name, shape, top, rows, starts, ends, run_labels):
+    """Pinta los tramos de una franja en la imagen de etiquetas compartida"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        labels = np.ndarray(shape, dtype=np.int32, buffer=shm.buf)
+        bottom = top + (int(rows[-1]) - top + 1 if len(rows) else 0)
+        paint_runs(labels[top:bottom], rows - top, starts, ends, run_labels)
+        del labels
+    finally:
+        shm.close()
+
+def _union_seam(parent, upper, lower, starts, ends):
+    """Une los tramos solapados de dos filas contiguas separadas por una costura.
+
+    upper y lower son rangos de índices globales de tramos (fila de arriba y
+    de abajo); se recorren en paralelo como en union_overlapping_runs.
+    """
+    a, a_end = upper
+    b, b_end = lower
+    while a < a_end and b < b_end:
+        if starts[a] < ends[b] and starts[b] < ends[a]:
+            root_a = _find(parent, a)
+            root_b = _find(parent, b)
+            if root_a != root_b:
+                if root_a < root_b:
+                    parent[root_b] = root_a
+                else:
+                    parent[root_a] = root_b
+        if ends[a] <= ends[b]:
+            a += 1
+        else:
+            b += 1
+
+def label_components_tiled(grid, border_margin=3, offset=(0, 0), board_size=None,
+                           workers=LABEL_WORKERS):
+    """label_components repartido en workers franjas horizontales (una por proceso).
+
+    El grid se copia una vez a memoria compartida. Cada proceso busca los
+    tramos de su franja y los une; el proceso principal une las franjas en
+    las costuras con union-find sobre las raíces locales y asigna etiquetas en
+    orden de barrido, así que el resultado es idéntico al de label_components.
+    El pintado de la imagen de etiquetas también se reparte por franjas.
+    """
+    height, width = grid.shape
+    tiles = max(1, min(workers, height))
+    bounds = [height * k // tiles for k in range(tiles + 1)]
+    executor = _get_executor(workers)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(grid.size, 1))
+    try:
+        shared = np.ndarray(grid.shape, dtype=np.bool_, buffer=shm.buf)
+        shared[:] = grid
+        del shared
+        futures = [executor.submit(_label_tile, shm.name, grid.shape, bounds[k], bounds[k + 1])
+                   for k in range(tiles)]
+        parts = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    counts = [len(part[0]) for part in parts]
+    first_run = np.concatenate(([0], np.cumsum(counts))).tolist()
+    run_count = first_run[-1]
+    if run_count == 0:
+        return np.zeros((height, width), dtype=np.int32), []
+    rows = np.concatenate([part[0] for part in parts])
+    starts = np.concatenate([part[1] for part in parts])
+    ends = np.concatenate([part[2] for part in parts])
+    local_roots = np.concatenate([part[3] + first for part, first in zip(parts, first_run)])
+
+    # Costuras: última fila de cada franja contra la primera de la siguiente
+    parent = local_roots.tolist()
+    start_list = starts.tolist()
+    end_list = ends.tolist()
+    for k in range(1, tiles):
+        seam = bounds[k]
+        upper = np.searchsorted(rows, [seam - 1, seam]).tolist()
+        lower = np.searchsorted(rows, [seam, seam + 1]).tolist()
+        _union_seam(parent, upper, lower, start_list, end_list)
+
+    # Raíz global de cada raíz local (pocas) y de ahí la de cada tramo
+    tile_roots = np.unique(local_roots)
+    global_roots = np.array([_find(parent, root) for root in tile_roots.tolist()], dtype=np.int64)
+    run_roots = global_roots[np.searchsorted(tile_roots, local_roots)]
+
+    # Etiquetas compactas en orden de aparición del primer tramo de cada componente
+    roots, first_index, inverse = np.unique(run_roots, return_index=True, return_inverse=True)
+    order = np.argsort(first_index)
+    rank = np.empty(len(roots), dtype=np.int32)
+    rank[order] = np.arange(1, len(roots) + 1, dtype=np.int32)
+    run_labels = rank[inverse.reshape(-1)]
+    component_count = len(roots)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(grid.size * 4, 1))
+    try:
+        shared = np.ndarray(grid.shape, dtype=np.int32, buffer=shm.buf)
+        shared[:] = 0
+        futures = [executor.submit(_paint_tile, shm.name, grid.shape, bounds[k],
+                                   *(column[first_run[k]:first_run[k + 1]]
+                                     for column in (rows, starts, ends, run_labels)))
+                   for k in range(tiles) if counts[k]]
+        for future in futures:
+            future.result()
+        labels = shared.copy()
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    components = component_stats(rows, starts, ends, run_labels, component_count,
+                                 (height, width), border_margin, offset, board_size)
+    return labels, components
@@ -0,0 +1,147 @@
+# trail.py - Trail de corte acotado con simplificación incremental
+
+from array import array
+from collections import deque
+from .config import *
+from .spatial import SegmentGrid, segment_distance_sq
+
+class TrailBuffer:
+    """Trail del jugador simplificado a medida que se recorre.
+
+    Los últimos safe_points puntos se guardan tal cual (son los que no
+    colisionan y los que consultan los enemigos cazadores). Al salir de esa
+    cola, cada punto extiende el tramo recto actual mientras todos los puntos
+    del tramo queden a menos de tolerance píxeles del segmento; si no, el
+    final del tramo se fija como vértice. Los vértices fijos se guardan en
+    arrays 'h' e indexan sus segmentos para las colisiones.
+
+    len() e iteración se refieren a la polilínea simplificada; raw_count
+    cuenta los puntos recibidos (los umbrales del juego usan este valor).
+    """
+    def __init__(self, safe_points=8, tolerance=TRAIL_SIMPLIFY_TOLERANCE,
+                 max_vertices=TRAIL_MAX_LENGTH, max_run=32, cell_size=TRAIL_INDEX_CELL_SIZE):
+        self.safe_points = safe_points
+        self.tolerance_sq = tolerance * tolerance
+        self.tolerance = tolerance
+        self.max_vertices = max_vertices
+        self.max_run = max_run
+        self.xs = array('h')  # Vértices fijos
+        self.ys = array('h')
+        self.run = []  # Puntos del tramo abierto desde el último vértice fijo
+        self.tail = deque()  # Últimos puntos sin simplificar
+        self.raw_count = 0
+        self.index = SegmentGrid(cell_size)
+
+    def __len__(self):
+        return len(self.xs) + (1 if self.run else 0) + len(self.tail)
+
+    def __iter__(self):
+        return iter(self.points())
+
+    def __getitem__(self, index):
+        # Acceso rápido a los puntos recientes (trail[-1], trail[-5:])
+        tail = self.tail
+        if isinstance(index, int) and -len(tail) <= index < 0:
+            return tail[index]
+        if (isinstance(index, slice) and index.stop is None and index.step is None and
+                index.start is not None and -len(tail) <= index.start < 0):
+            return list(tail)[index]
+        return self.points()[index]
+
+    def points(self):
+        """Polilínea simplificada: vértices fijos, final del tramo abierto y cola"""
+        points = list(zip(self.xs, self.ys))
+        if self.run:
+            points.append(self.run[-1])
+        points.extend(self.tail)
+        return points
+
+    def clear(self):
+        del self.xs[:]
+        del self.ys[:]
+        self.run.clear()
+        self.tail.clear()
+        self.raw_count = 0
+        self.index.clear()
+
+    def append(self, x, y):
+        """Añade un punto; el más antiguo de la cola pasa a la parte simplificada"""
+        self.raw_count += 1
+        self.tail.append((x, y))
+        if len(self.tail) > self.safe_points:
+            self._commit(*self.tail.popleft())
+
+    def _commit(self, x, y):
+        if not self.xs:
+            self._add_vertex(x, y)
+            return
+        run = self.run
+        if run and (len(run) >= self.max_run or not self._fits(run, x, y)):
+            self._add_vertex(*run[-1])
+            run.clear()
+        run.append((x, y))
+
+    def _fits(self, run, x, y):
+        """Verifica si el tramo desde el último vértice hasta (x, y) cubre todos sus puntos"""
+        ax, ay = self.xs[-1], self.ys[-1]
+        tolerance_sq = self.tolerance_sq
+        for px, py in run:
+            if segment_distance_sq(px, py, ax, ay, x, y) > tolerance_sq:
+                return False
+        return True
+
+    def _add_vertex(self, x, y):
+        xs, ys = self.xs, self.ys
+        if xs:
+            self.index.add_segment(xs[-1], ys[-1], x, y)
+        xs.append(x)
+        ys.append(y)
+        if len(xs) > self.max_vertices:
+            self._reduce()
+
+    def _reduce(self):
+        """Respaldo si se supera max_vertices: Douglas-Peucker con tolerancia creciente"""
+        points = list(zip(self.xs, self.ys))
+        tolerance = self.tolerance
+        while len(points) > self.max_vertices // 2:
+            tolerance *= 2
+            points = douglas_peucker(points, tolerance)
+        self.xs = array('h', (x for x, _ in points))
+        self.ys = array('h', (y for _, y in points))
+        self.index.clear()
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            self.index.add_segment(x0, y0, x1, y1)
+
+    def hits_circle(self, center_x, center_y, radius):
+        """Verifica si la parte antigua del trail (sin la cola) pasa a menos de radius"""
+        if self.index.query_circle(center_x, center_y, radius):
+            return True
+        if self.run:
+            # Tramo abierto: todavía no está en el índice
+            x1, y1 = self.run[-1]
+            return segment_distance_sq(center_x, center_y, self.xs[-1], self.ys[-1],
+                                       x1, y1) < radius * radius
+        return False
+
+def douglas_peucker(points, tolerance):
+    """Simplifica una polilínea conservando los puntos a más de tolerance del resultado"""
+    if len(points) < 3:
+        return list(points)
+    tolerance_sq = tolerance * tolerance
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        x0, y0 = points[first]
+        x1, y1 = points[last]
+        farthest, farthest_sq = None, tolerance_sq
+        for i in range(first + 1, last):
+            distance_sq = segment_distance_sq(points[i][0], points[i][1], x0, y0, x1, y1)
+            if distance_sq > farthest_sq:
+                farthest, farthest_sq = i, distance_sq
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep) if kept]